@@ -1,3 +1,4 @@
 from .compare import CompareNode
 from .evaluation_report import EvaluationReportNode
+from .node_registry import NodeRegistry
 from .send_email_node import SendEmailNode
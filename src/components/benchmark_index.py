@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import supervisely as sly
+from supervisely.api.file_api import FileInfo
+
+MAX_CACHED_INDEXES = 256
+INDEX_TTL = 600  # seconds
+INVALID_INDEX_TTL = 30  # seconds, for directories whose report is not rendered yet
+
+
+class BenchmarkIndex:
+    """
+    Lookup table of the artifacts of a model benchmark directory.
+
+    The directory is listed once, and every artifact (overview markdown, `.lnk` files,
+    `template.vue`) is classified so that later lookups need no API calls.
+    """
+
+    OVERVIEW_MARKER = "markdown_overview_markdown"
+    TEMPLATE_NAME = "template.vue"
+
+    def __init__(self, benchmark_dir: str, files: List[FileInfo]):
+        self.benchmark_dir = benchmark_dir.rstrip("/") + "/"
+        self.files: Dict[str, FileInfo] = {}
+        self.links: Dict[str, str] = {}
+        self.overview_markdown: Optional[str] = None
+        self.template: Optional[str] = None
+        for file_info in files:
+            self._add(file_info)
+
+    @classmethod
+    def build(cls, api: sly.Api, team_id: int, benchmark_dir: str) -> "BenchmarkIndex":
+        """
+        Lists the benchmark directory recursively (single API call) and builds the index.
+        """
+        files = api.file.list(team_id, benchmark_dir, recursive=True, return_type="fileinfo")
+        index = cls(benchmark_dir, files)
+        sly.logger.debug(
+            f"Indexed benchmark directory {index.benchmark_dir}",
+            extra={"files": len(index.files), "links": len(index.links)},
+        )
+        return index
+
+    @property
+    def is_valid(self) -> bool:
+        """
+        Returns whether the benchmark directory contains a rendered report.
+        """
+        return self.template is not None
+
+    def get_link(self, name: str) -> Optional[str]:
+        """
+        Returns the remote path of the `.lnk` file by its name, e.g. "Model Evaluation Report".
+        """
+        if not name.endswith(".lnk"):
+            name = f"{name}.lnk"
+        return self.links.get(name)
+
+    def get(self, relative_path: str) -> Optional[FileInfo]:
+        """
+        Returns the file info by its path relative to the benchmark dir.
+        """
+        return self.files.get(relative_path.lstrip("/"))
+
+    def _add(self, file_info: FileInfo):
+        if not file_info.path.startswith(self.benchmark_dir):
+            return
+        relative_path = file_info.path[len(self.benchmark_dir) :]
+        self.files[relative_path] = file_info
+        name = file_info.name
+        if name.endswith(".lnk"):
+            # report links in "visualizations/" take precedence over nested ones with the same name
+            if name not in self.links or relative_path.startswith("visualizations/"):
+                self.links[name] = file_info.path
+        elif relative_path == f"visualizations/{self.TEMPLATE_NAME}":
+            self.template = file_info.path
+        elif relative_path.startswith("visualizations/data/"):
+            if self.OVERVIEW_MARKER in name:
+                self.overview_markdown = file_info.path
+
+
+_indexes: OrderedDict[tuple, Tuple[BenchmarkIndex, float]] = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_benchmark_index(
+    api: sly.Api, team_id: int, benchmark_dir: str, refresh: bool = False
+) -> BenchmarkIndex:
+    """
+    Returns the cached index of the benchmark directory, building it on first access.
+    The index is rebuilt once it is older than `INDEX_TTL`, or `INVALID_INDEX_TTL` while the
+    directory has no rendered report, so files added later are picked up.
+    """
+    key = (team_id, benchmark_dir.rstrip("/") + "/")
+    with _indexes_lock:
+        cached = _indexes.get(key)
+        if cached is not None and not refresh:
+            index, built_at = cached
+            ttl = INDEX_TTL if index.is_valid else INVALID_INDEX_TTL
+            if time.monotonic() - built_at < ttl:
+                _indexes.move_to_end(key)
+                return index
+
+    index = BenchmarkIndex.build(api, team_id, benchmark_dir)
+    with _indexes_lock:
+        _indexes[key] = (index, time.monotonic())
+        _indexes.move_to_end(key)
+        while len(_indexes) > MAX_CACHED_INDEXES:
+            _indexes.popitem(last=False)
+    return index
+
+
+def invalidate_benchmark_index(team_id: int, benchmark_dir: str):
+    """
+    Drops the cached index of the benchmark directory.
+    """
+    with _indexes_lock:
+        _indexes.pop((team_id, benchmark_dir.rstrip("/") + "/"), None)
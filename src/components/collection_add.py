@@ -0,0 +1,81 @@
+import itertools
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import supervisely as sly
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_MAX_WORKERS = 4
+
+
+class CollectionAddResult(NamedTuple):
+    added: int
+    failed: List[int]  # items of the chunks that failed after all retries
+
+
+def add_to_collection(
+    api: sly.Api,
+    collection_id: int,
+    items: Iterable[int],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    retries: int = 3,
+    retry_delay: float = 2,
+    progress_cb: Optional[Callable[[int, int], None]] = None,
+) -> CollectionAddResult:
+    """
+    Adds items to the entities collection in chunks of `batch_size`, `max_workers` at a time.
+
+    `items` is consumed lazily: at most `2 * max_workers` chunks are in memory at once.
+    A failed chunk is retried `retries` times with exponential backoff and, if it still fails,
+    its IDs are returned in `failed` while the other chunks go on.
+    `progress_cb(added, failed)` is called after every chunk with the running totals.
+    """
+    items = iter(items)
+    added, failed = 0, []
+    in_flight: Dict[Future, List[int]] = {}
+
+    def add_chunk(chunk: List[int]) -> int:
+        for attempt in range(retries + 1):
+            try:
+                api.entities_collection.add_items(collection_id, chunk)
+                return len(chunk)
+            except Exception as e:
+                if attempt == retries:
+                    raise
+                delay = retry_delay * 2**attempt
+                sly.logger.warning(
+                    f"Failed to add {len(chunk)} items to collection {collection_id}, "
+                    f"retrying in {delay}s: {e}"
+                )
+                time.sleep(delay)
+
+    with ThreadPoolExecutor(max_workers, thread_name_prefix="collection_add") as executor:
+        while True:
+            while len(in_flight) < 2 * max_workers:
+                chunk = list(itertools.islice(items, batch_size))
+                if not chunk:
+                    break
+                in_flight[executor.submit(add_chunk, chunk)] = chunk
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = in_flight.pop(future)
+                try:
+                    added += future.result()
+                except Exception:
+                    sly.logger.error(
+                        f"Failed to add {len(chunk)} items to collection {collection_id}.",
+                        exc_info=True,
+                    )
+                    failed.extend(chunk)
+                if progress_cb is not None:
+                    progress_cb(added, len(failed))
+
+    sly.logger.info(
+        f"Added {added} items to collection {collection_id}.",
+        extra={"failed": len(failed)},
+    )
+    return CollectionAddResult(added, failed)
@@ -1,12 +1,17 @@
+import datetime
+import threading
 import time
-from typing import Any, Callable, Dict, List, Literal, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Literal, Optional, Set, Union
 from uuid import uuid4
 
 import supervisely as sly
-from src.components.comparison_history.comparison_history import (
-    ComparisonHistory,
-    ComparisonItem,
-)
+from src.components.comparison_cache import ComparisonResultCache, get_comparison_cache
+from src.components.comparison_job import ComparisonCancelled, ComparisonJob
+from src.components.evaluator import EvaluatorSessionManager, get_session_manager
+from src.components.link_cache import get_link_cache
+from src.components.persistent_history import PersistentHistory
+from src.components.state_flush import get_state_flusher
 from supervisely.app.content import DataJson
 from supervisely.app.widgets import (
     Button,
@@ -56,9 +61,110 @@ class ComparisonAutomation(Automation):
         return self.scheduler.is_job_scheduled(self.job_id)
 
 
+class ConditionalComparisonAutomation(Automation):
+    """
+    Automation that runs a comparison only when new evaluations appear in the project's
+    model benchmark directory. Each check costs a single listing call, and bursts of new
+    evaluations are debounced: the comparison fires once the set has been stable for
+    `debounce` seconds.
+    """
+
+    def __init__(
+        self,
+        api: sly.Api,
+        team_id: int,
+        benchmark_root: str,
+        func: Callable[[List[str], List[str]], Any],
+        debounce: int = 120,
+    ):
+        super().__init__()
+        self.api = api
+        self.team_id = team_id
+        self.benchmark_root = benchmark_root
+        self.func = func
+        self.debounce = debounce
+        self.job_id = f"compare_models_on_change_{uuid4()}"
+        self._known: Optional[Set[str]] = None
+        self._pending: Optional[Set[str]] = None
+        self._pending_since = 0.0
+
+    def list_candidates(self) -> Set[str]:
+        """
+        Returns the evaluation directories in the benchmark root (one listing call).
+        """
+        paths = self.api.file.listdir(self.team_id, self.benchmark_root)
+        return {path.rstrip("/") + "/" for path in paths}
+
+    def check(self) -> None:
+        """
+        Fires the comparison if the set of evaluation directories has changed and settled.
+        """
+        candidates = self.list_candidates()
+        if self._known is None:
+            self._known = candidates
+            sly.logger.info(f"Watching {len(candidates)} evaluations in {self.benchmark_root}.")
+            return
+        if candidates == self._known:
+            self._pending = None
+            return
+        now = time.time()
+        if candidates != self._pending:
+            self._pending = candidates
+            self._pending_since = now
+            sly.logger.info("Evaluation directories changed, waiting for them to settle.")
+            return
+        if now - self._pending_since < self.debounce:
+            return
+
+        new_dirs = sorted(candidates - self._known, key=self._evaluation_order)
+        previous_dirs = sorted(self._known & candidates, key=self._evaluation_order)
+        self._known = candidates
+        self._pending = None
+        if new_dirs:
+            sly.logger.info(f"New evaluations detected: {new_dirs}")
+            self.func(new_dirs, previous_dirs)
+
+    @staticmethod
+    def _evaluation_order(path: str) -> tuple:
+        """
+        Sorts evaluation directories ("{task_id}_{app}/") by their task ID, so the latest
+        evaluation comes last. Directories without a numeric task ID come first.
+        """
+        task_id = path.rstrip("/").rsplit("/", 1)[-1].split("_", 1)[0]
+        return (int(task_id), path) if task_id.isdigit() else (-1, path)
+
+    def apply(self, sec: int, *args) -> None:
+        self.scheduler.add_job(
+            self.check, interval=sec, job_id=self.job_id, replace_existing=True, *args
+        )
+        sly.logger.info(
+            f"Scheduled conditional model comparison job with ID {self.job_id}, "
+            f"checking for new evaluations every {sec} seconds."
+        )
+
+    def remove(self):
+        if self.scheduler.is_job_scheduled(self.job_id):
+            self.scheduler.remove_job(self.job_id)
+            sly.logger.info(f"Removed scheduled job: {self.job_id}")
+        else:
+            sly.logger.warning(f"Job {self.job_id} is not scheduled, cannot remove it.")
+
+    @property
+    def is_scheduled(self) -> bool:
+        """
+        Check if the automation job is scheduled.
+        """
+        return self.scheduler.is_job_scheduled(self.job_id)
+
+
 class CompareNode(SolutionElement):
     APP_SLUG = "supervisely-ecosystem/model-benchmark"
     COMPARISON_ENDPOINT = "run_comparison"
+    MAX_PARALLEL_COMPARISONS = 2
+    EVALUATOR_START_TIMEOUT = 300  # seconds
+    CONDITIONAL_DEBOUNCE = 120  # seconds
+    EVALUATOR_IDLE_TIMEOUT = 30 * 60  # seconds
+    WARM_EVALUATOR_SESSIONS = 1
 
     def __init__(
         self,
@@ -94,9 +200,7 @@ class CompareNode(SolutionElement):
         self.result_comparison_link = None
         self.result_best_checkpoint = None
 
-        self.agent_id = agent_id or self.get_available_agent_id()
-        if self.agent_id is None:
-            raise ValueError("No available agent found. Please check your agents.")
+        self._agent_id = agent_id
 
         self.card = self._create_card()
         self.node = SolutionCardNode(content=self.card, x=x, y=y)
@@ -107,6 +211,20 @@ class CompareNode(SolutionElement):
         ]
 
         self._finish_callbacks = []
+        self._jobs: Dict[str, ComparisonJob] = {}
+        self._jobs_lock = threading.Lock()
+
+    @property
+    def agent_id(self) -> int:
+        """
+        Returns the agent ID used to start the evaluator.
+        The available agent is looked up on first use, not when the node is built.
+        """
+        if self._agent_id is None:
+            self._agent_id = self.get_available_agent_id()
+            if self._agent_id is None:
+                raise ValueError("No available agent found. Please check your agents.")
+        return self._agent_id
 
     @property
     def is_automated(self) -> bool:
@@ -165,6 +283,59 @@ class CompareNode(SolutionElement):
             self._automation = ComparisonAutomation(self.send_comparison_request)
         return self._automation
 
+    @property
+    def conditional_automation(self) -> ConditionalComparisonAutomation:
+        """
+        Returns the automation instance that compares new evaluations as they appear.
+        """
+        if not hasattr(self, "_conditional_automation"):
+            self._conditional_automation = ConditionalComparisonAutomation(
+                self.api,
+                self.team_id,
+                self.benchmark_root,
+                self._compare_new_evaluations,
+                debounce=self.CONDITIONAL_DEBOUNCE,
+            )
+        return self._conditional_automation
+
+    @property
+    def benchmark_root(self) -> str:
+        """
+        Returns the Team Files directory where model benchmark saves evaluations of the project.
+        """
+        return f"/model-benchmark/{self.project.id}_{self.project.name}/"
+
+    @property
+    def is_conditional(self) -> bool:
+        """
+        Returns whether the comparison runs when new evaluations appear.
+        """
+        return (
+            DataJson()[self.widget_id].get("automation_settings", {}).get("is_conditional", False)
+        )
+
+    def _compare_new_evaluations(self, new_dirs: List[str], previous_dirs: List[str]) -> None:
+        """
+        Compares new evaluations against the reference: the first configured evaluation
+        directory or, if none is set, the latest evaluation seen before.
+        Directories are compared with a trailing "/", as `list_candidates` returns them.
+        """
+        if self.eval_dirs:
+            reference = self.eval_dirs[0]
+        elif previous_dirs:
+            reference = previous_dirs[-1]
+        else:
+            reference = None
+        if reference:
+            reference = reference.rstrip("/") + "/"
+        eval_dirs = [reference] if reference else []
+        eval_dirs += [eval_dir for eval_dir in new_dirs if eval_dir.rstrip("/") + "/" != reference]
+        if len(eval_dirs) < 2:
+            sly.logger.info("Not enough evaluations to compare yet.")
+            return
+        self.evaluation_dirs = eval_dirs
+        self.send_comparison_request()
+
     @property
     def comparison_history_modal(self) -> Dialog:
         """
@@ -172,12 +343,12 @@ class CompareNode(SolutionElement):
         """
         if not hasattr(self, "_comparison_history_modal"):
             self._comparison_history_modal = Dialog(
-                "Comparison History", self.comparison_history, "small"
+                "Comparison History", self.comparison_history.content, "small"
             )
         return self._comparison_history_modal
 
     @property
-    def comparison_history(self) -> ComparisonHistory:
+    def comparison_history(self) -> "ComparisonHistory":
         """
         Returns the comparison history instance.
         """
@@ -214,6 +385,16 @@ class CompareNode(SolutionElement):
             "Interval (seconds)",
             "Set the interval for periodic comparison.",
         )
+        conditional_switch = Switch(False)
+        self._get_conditional_switch_value = conditional_switch.is_switched
+        check_interval_input = InputNumber(60, min=30, max=3600, step=15)
+        self._get_check_interval = check_interval_input.get_value
+        check_interval_input.disable()
+        check_interval_field = Field(
+            check_interval_input,
+            "Check interval (seconds)",
+            "How often to look for new evaluations in the project's model benchmark folder.",
+        )
         apply_btn = Button(
             "Apply settings",
             button_type="primary",
@@ -227,12 +408,26 @@ class CompareNode(SolutionElement):
                     "Configure whether you want to automate the comparison process.",
                 ),
                 interval_field,
+                Field(
+                    conditional_switch,
+                    "Conditional comparison",
+                    "Run the comparison only when new evaluations appear.",
+                ),
+                check_interval_field,
                 apply_btn,
-                Field(Container(), "Conditional comparison", "Not implemented yet."),
             ]
         )
         automation_modal = Dialog("Automation Settings", automation_modal_layout, "tiny")
 
+        def on_settings_disabled():
+            if automation_switch.is_switched() or conditional_switch.is_switched():
+                return
+            with get_state_flusher().transaction():
+                apply_btn.disable()
+                self.save()
+                self.hide_automated_badge()
+                self._update_properties()
+
         @automation_switch.value_changed
         def automation_switch_change_cb(is_on: bool):
             if is_on:
@@ -240,22 +435,35 @@ class CompareNode(SolutionElement):
                 apply_btn.enable()
             else:
                 automation_periodic_input.disable()
-                apply_btn.disable()
                 if self.automation.is_scheduled:
                     self.automation.remove()
                     sly.logger.info("Periodic comparison automation disabled.")
-                self.save()
-                self.hide_automated_badge()
-                self._update_properties()
+                on_settings_disabled()
+
+        @conditional_switch.value_changed
+        def conditional_switch_change_cb(is_on: bool):
+            if is_on:
+                check_interval_input.enable()
+                apply_btn.enable()
+            else:
+                check_interval_input.disable()
+                if self.conditional_automation.is_scheduled:
+                    self.conditional_automation.remove()
+                    sly.logger.info("Conditional comparison automation disabled.")
+                on_settings_disabled()
 
         @apply_btn.click
         def enable_automation():
-            sec = automation_periodic_input.get_value()
-            self.automation.apply(sec)
-            sly.logger.info(f"Scheduled periodic comparison every {sec} seconds.")
-            self.save()
-            self._update_properties()
-            self.show_automated_badge()
+            if automation_switch.is_switched():
+                sec = automation_periodic_input.get_value()
+                self.automation.apply(sec)
+                sly.logger.info(f"Scheduled periodic comparison every {sec} seconds.")
+            if conditional_switch.is_switched():
+                self.conditional_automation.apply(check_interval_input.get_value())
+            with get_state_flusher().transaction():
+                self.save()
+                self._update_properties()
+                self.show_automated_badge()
             automation_modal.hide()
 
         return automation_modal
@@ -270,6 +478,12 @@ class CompareNode(SolutionElement):
         DataJson()[self.widget_id]["automation_settings"][
             "automation_interval"
         ] = self._get_automation_interval()
+        DataJson()[self.widget_id]["automation_settings"][
+            "is_conditional"
+        ] = self._get_conditional_switch_value()
+        DataJson()[self.widget_id]["automation_settings"][
+            "check_interval"
+        ] = self._get_check_interval()
         DataJson().send_changes()
 
     def _create_card(self) -> SolutionCard:
@@ -312,9 +526,30 @@ class CompareNode(SolutionElement):
 
             @self._run_btn.click
             def run_comparison():
-                self._run_btn.disable()
                 self.send_comparison_request()
-                self._run_btn.enable()
+
+        if not hasattr(self, "_force_run_btn"):
+            self._force_run_btn = Button(
+                "Re-run (ignore cache)",
+                icon="zmdi zmdi-refresh",
+                button_size="mini",
+                plain=True,
+                button_type="text",
+            )
+
+            @self._force_run_btn.click
+            def force_run_comparison():
+                self.send_comparison_request(force=True)
+
+        if not hasattr(self, "_cancel_btn"):
+            self._cancel_btn = Button(
+                "Cancel running",
+                icon="zmdi zmdi-stop",
+                button_size="mini",
+                plain=True,
+                button_type="text",
+            )
+            self._cancel_btn.click(self.cancel_comparisons)
 
         if not hasattr(self, "_automate_btn"):
             self._automate_btn = Button(
@@ -346,88 +581,204 @@ class CompareNode(SolutionElement):
         return [
             self._automate_btn,
             self._run_btn,
+            self._force_run_btn,
+            self._cancel_btn,
             self._comparison_history_btn,
             self._tasks_history_btn,
         ]
 
-    def run_evaluator_session_if_needed(self):
-        module_id = self.api.app.get_ecosystem_module_id(self.APP_SLUG)
-        available_sessions = self.api.app.get_sessions(
-            self.team_id, module_id, statuses=[self.api.task.Status.STARTED]
-        )
-        session_running = len(available_sessions) > 0
-        if session_running:
-            sly.logger.info("Model Benchmark Evaluator session is already running, skipping start.")
-            self.tasks_history.add_task(*available_sessions[0])
-            return available_sessions[0].task_id
-
-        sly.logger.info("Starting Model Benchmark Evaluator task...")
-        task_info_json = self.api.task.start(
-            agent_id=self.agent_id,
-            app_id=None,
-            workspace_id=self.workspace_id,
-            description=f"Solutions: {self.api.task_id}",
-            module_id=module_id,
+    @property
+    def session_manager(self) -> EvaluatorSessionManager:
+        """
+        Returns the evaluator session manager shared by all comparison nodes of the team.
+        """
+        return get_session_manager(
+            self.api,
+            self.team_id,
+            self.workspace_id,
+            app_slug=self.APP_SLUG,
+            warm_size=self.WARM_EVALUATOR_SESSIONS,
+            idle_timeout=self.EVALUATOR_IDLE_TIMEOUT,
+            start_timeout=self.EVALUATOR_START_TIMEOUT,
         )
-        if task_info_json is None:
-            raise RuntimeError("Failed to start the evaluation task.")
-        self.tasks_history.add_task(*task_info_json)
-        task_id = task_info_json["taskId"]
-
-        current_time = time.time()
-        while task_status := self.api.task.get_status(task_id) != self.api.task.Status.STARTED:
-            sly.logger.info("Waiting for the evaluation task to start... Status: %s", task_status)
-            time.sleep(5)
-            if time.time() - current_time > 300:  # 5 minutes timeout
-                sly.logger.warning(
-                    "Timeout reached while waiting for the evaluation task to start."
-                )
-                break
 
-        return task_id
+    def run_evaluator_session_if_needed(self, cancel_event: Optional[threading.Event] = None):
+        """
+        Returns the task ID of a warm evaluator session, starting a new one only if needed.
+        """
+        return self.session_manager.acquire(
+            lambda: self.agent_id,
+            cancel_event=cancel_event,
+            on_start=lambda task_info: self.tasks_history.add_task(*task_info),
+        )
 
-    def send_comparison_request(self):
+    def send_comparison_request(self, force: bool = False) -> Optional[ComparisonJob]:
         """
-        Sends a request to the backend to start the evaluation process.
+        Queues a comparison of the current evaluation directories and returns immediately.
+        The comparison runs in the background, its progress is shown in the card badges.
+
+        If the same directories were already compared and have not changed since, the stored
+        result is reused without running the evaluator. Pass `force=True` to recompute.
+        If a comparison of the same directories is already queued or running, that job is
+        returned instead of queuing another one.
         """
         # self.warning.hide()
-        self.hide_failed_badge()
-        self.hide_running_badge()
-        self.hide_finished_badge()
         if not self.eval_dirs or len(self.eval_dirs) < 2:
             sly.logger.warning("Not enough evaluation directories provided for comparison.")
-            self.show_failed_badge()
-            # self.warning.show()
-            return
-        self.show_running_badge()
+            with get_state_flusher().transaction():
+                self.hide_finished_badge()
+                self.show_failed_badge()
+                # self.warning.show()
+            return None
+        with self._jobs_lock:
+            for job in self._jobs.values():
+                if not job.is_finished and not job.is_cancelled and job.eval_dirs == self.eval_dirs:
+                    sly.logger.info(f"Comparison of these directories is already {job.status}.")
+                    return job
+            job = ComparisonJob(self.eval_dirs, force=force)
+            self._jobs[job.id] = job
+        job.future = self.executor.submit(self._run_comparison_job, job)
+        job.future.add_done_callback(lambda _: self._on_job_finished(job))
+        self._update_progress()
+        sly.logger.info(f"Comparison job {job.id} is queued.", extra={"eval_dirs": job.eval_dirs})
+        return job
+
+    def cancel_comparisons(self) -> None:
+        """
+        Cancels all queued and running comparisons.
+        """
+        for job in self.active_jobs:
+            job.cancel()
+            sly.logger.info(f"Cancellation requested for comparison job {job.id}.")
+
+    @property
+    def active_jobs(self) -> List[ComparisonJob]:
+        """
+        Returns the comparison jobs that are queued or running.
+        """
+        with self._jobs_lock:
+            return [job for job in self._jobs.values() if not job.is_finished]
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """
+        Returns the thread pool that runs comparison jobs.
+        """
+        if not hasattr(self, "_executor"):
+            self._executor = ThreadPoolExecutor(
+                self.MAX_PARALLEL_COMPARISONS, thread_name_prefix="comparison"
+            )
+        return self._executor
+
+    @property
+    def comparison_cache(self) -> ComparisonResultCache:
+        """
+        Returns the cache of finished comparisons shared by all comparison nodes.
+        """
+        return get_comparison_cache()
+
+    def _get_cache_key(self, job: ComparisonJob) -> Optional[str]:
         try:
-            # raise RuntimeError("This is a test error to check error handling.")
-            task_id = self.run_evaluator_session_if_needed()
-            request_data = {"eval_dirs": self.eval_dirs}
+            return self.comparison_cache.make_key(self.api, self.team_id, job.eval_dirs)
+        except Exception:
+            sly.logger.warning("Failed to fingerprint evaluation directories.", exc_info=True)
+            return None
+
+    def _run_comparison_job(self, job: ComparisonJob) -> None:
+        try:
+            job.check_cancelled()
+            self._set_job_status(job, ComparisonJob.Status.CHECKING_CACHE)
+            cache_key = self._get_cache_key(job)
+            cached = None
+            if cache_key is not None and not job.force:
+                cached = self.comparison_cache.get(cache_key)
+            if cached is not None:
+                sly.logger.info(
+                    f"Evaluation directories are unchanged, reusing comparison {cached['result_dir']}."
+                )
+                job.from_cache = True
+                job.task_id = cached["task_id"]
+                job.result_dir = cached["result_dir"]
+                job.result_link = cached["result_link"]
+                is_new_result = job.result_dir != self.result_comparison_dir
+                self.result_comparison_dir = job.result_dir
+                self.result_comparison_link = job.result_link
+                if is_new_result:
+                    for cb in self._finish_callbacks:
+                        cb(job.result_dir, job.result_link)
+                self._set_job_status(job, ComparisonJob.Status.DONE)
+                return
+
+            job.check_cancelled()
+            self._set_job_status(job, ComparisonJob.Status.STARTING_EVALUATOR)
+            job.task_id = self.run_evaluator_session_if_needed(cancel_event=job.cancel_event)
+
+            job.check_cancelled()
+            self._set_job_status(job, ComparisonJob.Status.REQUESTING)
+            request_data = {"eval_dirs": job.eval_dirs}
             response = self.api.task.send_request(
-                task_id, self.COMPARISON_ENDPOINT, data=request_data
+                job.task_id, self.COMPARISON_ENDPOINT, data=request_data
             )
             if "error" in response:
                 raise RuntimeError(f"Error in evaluation request: {response['error']}")
             sly.logger.info("Evaluation request sent successfully.")
-            self.result_comparison_dir = response.get("data")
-            self.result_comparison_link = self._get_url_from_lnk_path(
-                self.result_comparison_dir + "/Model Comparison Report.lnk"
+
+            self._set_job_status(job, ComparisonJob.Status.RESOLVING_LINK)
+            job.result_dir = response.get("data")
+            job.result_link = self._get_url_from_lnk_path(
+                job.result_dir + "/Model Comparison Report.lnk"
             )
+            job.check_cancelled()
+            if cache_key is not None and job.result_link:
+                self.comparison_cache.put(cache_key, job.result_dir, job.result_link, job.task_id)
+            self.result_comparison_dir = job.result_dir
+            self.result_comparison_link = job.result_link
             # @ todo: find the best checkpoint from the evaluation results
             # self._update_properties()
             comparison = ComparisonItem(
-                task_id, self.eval_dirs, self.result_comparison_dir, self.result_best_checkpoint
+                job.task_id, job.eval_dirs, job.result_dir, self.result_best_checkpoint
             )
-            self.comparison_history.add_comparison(comparison)
+            self.comparison_history.add_task(comparison)
             for cb in self._finish_callbacks:
-                cb(self.result_comparison_dir, self.result_comparison_link)
-            self.show_finished_badge()
-            self.hide_running_badge()
-        except:
+                cb(job.result_dir, job.result_link)
+            self._set_job_status(job, ComparisonJob.Status.DONE)
+        except ComparisonCancelled:
+            sly.logger.info(f"Comparison job {job.id} was cancelled.")
+            self._set_job_status(job, ComparisonJob.Status.CANCELLED)
+        except Exception as e:
             sly.logger.error("Evaluation failed.", exc_info=True)
-            self.show_failed_badge()
+            self._set_job_status(job, ComparisonJob.Status.FAILED, error=str(e))
+
+    def _set_job_status(self, job: ComparisonJob, status: str, error: str = None) -> None:
+        job.set_status(status, error)
+        sly.logger.debug(f"Comparison job {job.id}: {status}")
+        with get_state_flusher().transaction():
+            if status == ComparisonJob.Status.DONE:
+                self.hide_failed_badge()
+                self.show_finished_badge()
+            elif status == ComparisonJob.Status.FAILED:
+                self.hide_finished_badge()
+                self.show_failed_badge()
+            self._update_progress()
+
+    def _on_job_finished(self, job: ComparisonJob) -> None:
+        if job.future is not None and job.future.cancelled():
+            job.set_status(ComparisonJob.Status.CANCELLED)
+        with self._jobs_lock:
+            self._jobs.pop(job.id, None)
+        self._update_progress()
+
+    def _update_progress(self) -> None:
+        """
+        Reflects the stage of the in-flight comparisons in the running badge.
+        """
+        jobs = self.active_jobs
+        if not jobs:
             self.hide_running_badge()
+            return
+        stage = jobs[-1].status
+        label = f"⚡ {stage}" if len(jobs) == 1 else f"⚡ {len(jobs)} running: {stage}"
+        self.show_running_badge(label)
 
     def get_available_agent_id(self) -> int:
         agents = self.api.agent.get_list_available(self.team_id, True)
@@ -441,49 +792,33 @@ class CompareNode(SolutionElement):
         return fn
 
     def _get_url_from_lnk_path(self, remote_lnk_path) -> str:
-        if not self.api.file.exists(self.team_id, remote_lnk_path):
-            sly.logger.warning(
-                f"Link file {remote_lnk_path} does not exist in the benchmark directory."
-            )
-            return ""
+        return get_link_cache().get_url(self.api, self.team_id, remote_lnk_path)
 
-        self.api.file.download(self.team_id, remote_lnk_path, "./model_evaluation_report.lnk")
-        with open("./model_evaluation_report.lnk", "r") as file:
-            base_url = file.read().strip()
-
-        sly.fs.silent_remove("./model_evaluation_report.lnk")
-
-        return sly.utils.abs_url(base_url)
-
-    def show_running_badge(self):
+    def show_running_badge(self, label: str = "⚡"):
         """
         Updates the card to show that the evaluation is running.
         """
         self.card.update_badge_by_key(
-            key="In Progress", label="⚡", plain=True, badge_type="warning"
+            key="In Progress", label=label, plain=True, badge_type="warning"
         )
-        self._run_btn.disable()
 
     def hide_running_badge(self):
         """
         Hides the running badge from the card.
         """
         self.card.remove_badge_by_key(key="In Progress")
-        self._run_btn.enable()
 
     def show_finished_badge(self):
         """
         Updates the card to show that the comparison is finished.
         """
         self.card.update_badge_by_key(key="Finished", label="✅", plain=True, badge_type="success")
-        self._run_btn.disable()
 
     def hide_finished_badge(self):
         """
         Hides the finished badge from the card.
         """
         self.card.remove_badge_by_key(key="Finished")
-        self._run_btn.enable()
 
     def show_failed_badge(self):
         """
@@ -547,13 +882,14 @@ class CompareNode(SolutionElement):
             },
             {
                 "key": "Automatic re-deployment",
-                "value": "✔️" if self.is_automated else "✖",
+                "value": "✔️" if self.is_automated or self.is_conditional else "✖",
                 "highlight": False,
                 "link": False,
             },
         ]
-        for prop in new_propetries:
-            self.card.update_property(**prop)
+        with get_state_flusher().transaction():
+            for prop in new_propetries:
+                self.card.update_property(**prop)
 
 
 class ComparisonItem:
@@ -585,53 +921,29 @@ class ComparisonItem:
         }
 
 
-class ComparisonHistory(TasksHistory):
+class ComparisonHistory(PersistentHistory):
     def __init__(
         self,
+        name: str = "comparison_history",
         widget_id: str = None,
     ):
-        super().__init__(widget_id=widget_id)
-        self._remove_unused_args()
-        self._table_columns = [
-            "ID" "Created At",
-            "Task ID",
-            "Input Evaluations",
-            "Result Folder",
-            "Best checkpoint",
-        ]
-        self._columns_keys = [
-            ["id"],
-            ["created_at"],
-            ["task_id"],
-            ["input_evals"],
-            ["result_folder"],
-            ["best_checkpoint"],
-        ]
-
-    def update(self):
-        self.table.clear()
-        for comparison in self.get_tasks():
-            self.table.insert_row(list(comparison.values()))
-
-    def add_task(self, task: Union[ComparisonItem, Dict[str, Any]]) -> int:
-        if isinstance(task, ComparisonItem):
-            task = task.to_json()
-        super().add_task(task)
-        self.update()
-
-    def _remove_unused_args(self):
-        """
-        Removes unused arguments from the class to avoid confusion.
-        """
-        unused_args = [
-            "api",
-            "_stop_autorefresh",
-            "_refresh_thread",
-            "_refresh_interval",
-            "_autorefresh",
-            "stop_autorefresh",
-            "start_autorefresh",
-        ]
-        for arg in unused_args:
-            if hasattr(self, arg):
-                delattr(self, arg)
+        super().__init__(
+            name,
+            columns=[
+                "ID",
+                "Created At",
+                "Task ID",
+                "Input Evaluations",
+                "Result Folder",
+                "Best checkpoint",
+            ],
+            columns_keys=[
+                ["id"],
+                ["created_at"],
+                ["task_id"],
+                ["input_evals"],
+                ["result_folder"],
+                ["best_checkpoint"],
+            ],
+            widget_id=widget_id,
+        )
@@ -0,0 +1,126 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import supervisely as sly
+from src.components.benchmark_index import get_benchmark_index
+from src.components.local_files import get_data_path, read_json, write_json
+
+
+class ComparisonResultCache:
+    """
+    Cache of finished comparisons keyed by the set of evaluation directories and their contents.
+
+    The key does not depend on the order of the directories, and it changes whenever any file
+    in one of them is added, removed or modified, so a stale result is never returned.
+    """
+
+    def __init__(self, max_size: int = 256, cache_path: Optional[str] = None):
+        self.max_size = max_size
+        self.cache_path = cache_path or get_data_path("comparison_cache.json")
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the hit/miss counters of the cache.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    @staticmethod
+    def fingerprint(api: sly.Api, team_id: int, eval_dir: str) -> str:
+        """
+        Returns a fingerprint of the evaluation directory contents (one listing call).
+        """
+        index = get_benchmark_index(api, team_id, eval_dir, refresh=True)
+        files = sorted((path, info.sizeb, info.updated_at) for path, info in index.files.items())
+        return hashlib.sha1(repr(files).encode()).hexdigest()
+
+    def make_key(self, api: sly.Api, team_id: int, eval_dirs: List[str]) -> str:
+        """
+        Returns the cache key of the comparison of the given evaluation directories.
+        """
+        dirs = sorted({eval_dir.rstrip("/") for eval_dir in eval_dirs})
+        parts = [(eval_dir, self.fingerprint(api, team_id, eval_dir)) for eval_dir in dirs]
+        return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the stored result (`result_dir`, `result_link`, `task_id`, `created_at`).
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(result)
+
+    def put(self, key: str, result_dir: str, result_link: str, task_id: int = None) -> None:
+        with self._lock:
+            self._entries[key] = {
+                "result_dir": result_dir,
+                "result_link": result_link,
+                "task_id": task_id,
+                "created_at": time.time(),
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            write_json(self.cache_path, list(self._entries.items()))
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """
+        Removes the entry by key. Without a key, clears the whole cache.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            write_json(self.cache_path, list(self._entries.items()))
+
+    def _load(self):
+        entries = read_json(self.cache_path, [])
+        if not isinstance(entries, list):
+            sly.logger.warning(f"Ignoring the comparison cache {self.cache_path}: not a list.")
+            return
+        skipped = 0
+        for entry in entries[-self.max_size :]:
+            try:
+                key, result = entry
+                if not isinstance(key, str) or not isinstance(result, dict):
+                    raise TypeError("key must be a string and result a dict")
+                if not isinstance(result["result_dir"], str):
+                    raise TypeError("result_dir must be a string")
+                if not isinstance(result["result_link"], str):
+                    raise TypeError("result_link must be a string")
+            except (TypeError, ValueError, KeyError):
+                skipped += 1
+                continue
+            self._entries[key] = result
+        if skipped:
+            sly.logger.warning(f"Skipped {skipped} malformed entries of the comparison cache.")
+
+
+_comparison_cache = None
+_comparison_cache_lock = threading.Lock()
+
+
+def get_comparison_cache() -> ComparisonResultCache:
+    """
+    Returns the comparison result cache shared by all comparison nodes.
+    """
+    global _comparison_cache
+    with _comparison_cache_lock:
+        if _comparison_cache is None:
+            _comparison_cache = ComparisonResultCache()
+        return _comparison_cache
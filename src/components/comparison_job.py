@@ -0,0 +1,75 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional
+from uuid import uuid4
+
+
+class ComparisonCancelled(Exception):
+    """Raised inside a comparison job when it has been cancelled."""
+
+
+class ComparisonJob:
+    """
+    A single model comparison running in the background with its own lifecycle.
+    """
+
+    class Status:
+        QUEUED = "queued"
+        CHECKING_CACHE = "checking cache"
+        STARTING_EVALUATOR = "starting evaluator"
+        REQUESTING = "requesting"
+        RESOLVING_LINK = "resolving link"
+        DONE = "done"
+        FAILED = "failed"
+        CANCELLED = "cancelled"
+
+    FINAL_STATUSES = (Status.DONE, Status.FAILED, Status.CANCELLED)
+
+    def __init__(self, eval_dirs: List[str], force: bool = False):
+        self.id = uuid4().hex
+        self.eval_dirs = list(eval_dirs)
+        self.force = force
+        self.from_cache = False
+        self.status = self.Status.QUEUED
+        self.task_id: Optional[int] = None
+        self.result_dir: Optional[str] = None
+        self.result_link: Optional[str] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.future: Optional[Future] = None
+        self.cancel_event = threading.Event()
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in self.FINAL_STATUSES
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def cancel(self) -> None:
+        """
+        Requests cancellation. A queued job is dropped, a running one stops at the next stage.
+        """
+        self.cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def check_cancelled(self) -> None:
+        """
+        Raises ComparisonCancelled if the job has been cancelled.
+        """
+        if self.cancel_event.is_set():
+            raise ComparisonCancelled(f"Comparison job {self.id} was cancelled.")
+
+    def set_status(self, status: str, error: Optional[str] = None) -> None:
+        self.status = status
+        if error is not None:
+            self.error = error
+        if self.is_finished:
+            self.finished_at = time.time()
+
+    def __repr__(self) -> str:
+        return f"ComparisonJob(id={self.id}, status={self.status}, eval_dirs={self.eval_dirs})"
@@ -1,11 +1,16 @@
 from typing import Literal, Optional
 
 import supervisely as sly
+from src.components.benchmark_index import BenchmarkIndex, get_benchmark_index
+from src.components.link_cache import get_link_cache
+from src.components.remote_files import read_remote_text
 from supervisely.app.widgets import Icons, SolutionCard
 from supervisely.solution.base_node import SolutionCardNode, SolutionElement
 
 
 class EvaluationReportNode(SolutionElement):
+    REPORT_LINK_NAME = "Model Evaluation Report.lnk"
+
     def __init__(
         self,
         api: sly.Api,
@@ -68,8 +73,7 @@ class EvaluationReportNode(SolutionElement):
                 self.card.link = ""
             return
         self._benchmark_dir = benchmark_dir
-        lnk_path = f"{self._benchmark_dir.rstrip('/')}/visualizations/Model Evaluation Report.lnk"
-        self.url = self._get_url_from_lnk_path(lnk_path)
+        self.url = self._get_report_url()
         self.markdown_overview = self._get_overview_markdown()
         if hasattr(self, "card"):
             self.card.link = self.url
@@ -83,23 +87,32 @@ class EvaluationReportNode(SolutionElement):
             description=self.description, properties=self._property_from_md()
         )
 
-    def _get_url_from_lnk_path(self, remote_lnk_path) -> str:
-        if not remote_lnk_path:
-            sly.logger.warning("Remote link path is empty.")
-            return ""
-        if not self.api.file.exists(self.team_id, remote_lnk_path):
+    @property
+    def benchmark_index(self) -> Optional[BenchmarkIndex]:
+        """
+        Returns the cached artifact index of the benchmark directory.
+        """
+        if not self.benchmark_dir:
+            return None
+        return get_benchmark_index(self.api, self.team_id, self.benchmark_dir)
+
+    def _get_report_url(self) -> str:
+        """
+        Returns the URL of the evaluation report from the benchmark index.
+        """
+        lnk_path = self.benchmark_index.get_link(self.REPORT_LINK_NAME)
+        if lnk_path is None:
             sly.logger.warning(
-                f"Link file {remote_lnk_path} does not exist in the benchmark directory."
+                f"Link file '{self.REPORT_LINK_NAME}' does not exist in the benchmark directory."
             )
             return ""
+        return get_link_cache().get_url(self.api, self.team_id, lnk_path, check_exists=False)
 
-        self.api.file.download(self.team_id, remote_lnk_path, "./model_evaluation_report.lnk")
-        with open("./model_evaluation_report.lnk", "r") as file:
-            base_url = file.read().strip()
-
-        sly.fs.silent_remove("./model_evaluation_report.lnk")
-
-        return sly.utils.abs_url(base_url)
+    def _get_url_from_lnk_path(self, remote_lnk_path) -> str:
+        if not remote_lnk_path:
+            sly.logger.warning("Remote link path is empty.")
+            return ""
+        return get_link_cache().get_url(self.api, self.team_id, remote_lnk_path)
 
     # def _get_valid_benchmark_id(self, benchmark_id: int = None) -> int:
     #     benchmark_dir = f"/model-benchmark/{self.project.id}_{self.project.name}"
@@ -140,24 +153,18 @@ class EvaluationReportNode(SolutionElement):
         """
         Returns the overview markdown for the evaluation report.
         """
-        from tempfile import TemporaryDirectory
-
         if not self.benchmark_dir:
             sly.logger.warning("Benchmark directory is not set.")
             return None
 
-        vis_data_dir = "{}visualizations/data/".format(self.benchmark_dir)
-        for filepath in self.api.file.listdir(self.team_id, vis_data_dir):
-            if "markdown_overview_markdown" in filepath:
-                with TemporaryDirectory() as temp_dir:
-                    local_path = f"{temp_dir}/markdown_overview.md"
-                    self.api.file.download(self.team_id, filepath, local_path)
-                    with open(local_path, "r") as f:
-                        lines = f.readlines()
-                        return "".join(lines[:-1]) if len(lines) > 1 else ""
-
-        sly.logger.warning("No overview markdown found in the benchmark directory.")
-        return None
+        filepath = self.benchmark_index.overview_markdown
+        if filepath is None:
+            sly.logger.warning("No overview markdown found in the benchmark directory.")
+            return None
+
+        text = read_remote_text(self.api, self.team_id, filepath)
+        lines = text.splitlines(keepends=True)
+        return "".join(lines[:-1]) if len(lines) > 1 else ""
 
     def _property_from_md(self):
         """
@@ -0,0 +1,336 @@
+import random
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Set
+
+import supervisely as sly
+from src.components.comparison_job import ComparisonCancelled
+from supervisely.solution.scheduler import TasksScheduler
+
+
+class ReadinessResult(NamedTuple):
+    """Outcome of waiting for a task to start."""
+
+    task_id: int
+    status: Optional[str]
+    ready: bool
+    waited: float
+    polls: int
+
+
+def wait_for_task_ready(
+    api: sly.Api,
+    task_id: int,
+    deadline: float = 300,
+    initial_delay: float = 1.0,
+    max_delay: float = 30.0,
+    backoff: float = 2.0,
+    jitter: float = 0.2,
+    cancel_event: Optional[threading.Event] = None,
+) -> ReadinessResult:
+    """
+    Waits until the task is started, polling its status with exponential backoff and jitter.
+
+    Returns early if the task reaches a terminal status (error, stopped, finished),
+    the deadline (in seconds) is exceeded or `cancel_event` is set.
+    """
+    Status = api.task.Status
+    terminal_statuses = (Status.ERROR, Status.STOPPED, Status.TERMINATING, Status.FINISHED)
+    cancel_event = cancel_event or threading.Event()
+
+    start = time.monotonic()
+    delay = initial_delay
+    polls = 0
+    while True:
+        status = api.task.get_status(task_id)
+        polls += 1
+        waited = time.monotonic() - start
+        if status == Status.STARTED:
+            ready = True
+            break
+        if status in terminal_statuses:
+            sly.logger.warning(f"Task {task_id} reached terminal status '{status}' before start.")
+            ready = False
+            break
+        remaining = deadline - waited
+        if remaining <= 0:
+            sly.logger.warning(f"Timeout reached while waiting for task {task_id} to start.")
+            ready = False
+            break
+        sleep_time = min(delay * random.uniform(1 - jitter, 1 + jitter), remaining)
+        sly.logger.info(
+            f"Waiting for task {task_id} to start... Status: {status}, "
+            f"next check in {sleep_time:.1f}s"
+        )
+        if cancel_event.wait(sleep_time):
+            ready = False
+            break
+        delay = min(delay * backoff, max_delay)
+
+    status = getattr(status, "value", status)
+    result = ReadinessResult(task_id, status, ready, waited, polls)
+    sly.logger.info(
+        f"Task {task_id} readiness: {result.status} after {result.waited:.1f}s ({polls} polls).",
+        extra=result._asdict(),
+    )
+    return result
+
+
+class EvaluatorSessionManager:
+    """
+    Keeps Model Benchmark evaluator sessions warm and shares them between comparisons.
+
+    The module ID is resolved once. Sessions are health-checked before reuse and by a periodic
+    maintenance job, which also keeps `warm_size` sessions running while comparisons are active
+    and stops the sessions started by the manager after `idle_timeout` seconds without use.
+    """
+
+    def __init__(
+        self,
+        api: sly.Api,
+        team_id: int,
+        workspace_id: int,
+        app_slug: str,
+        warm_size: int = 1,
+        idle_timeout: int = 30 * 60,
+        health_check_interval: int = 60,
+        start_timeout: int = 300,
+    ):
+        self.api = api
+        self.team_id = team_id
+        self.workspace_id = workspace_id
+        self.app_slug = app_slug
+        self.warm_size = warm_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.start_timeout = start_timeout
+
+        self._module_id = None
+        self._last_used: Dict[int, float] = {}
+        self._last_checked: Dict[int, float] = {}
+        self._owned: Set[int] = set()
+        self._starting = 0  # sessions being started, by `acquire` or the maintenance job
+        self._last_acquired_at = 0.0
+        self._get_agent_id: Optional[Callable[[], int]] = None
+        self._lock = threading.RLock()
+        self._start_lock = threading.Lock()
+        self._job_id = f"evaluator_sessions_{team_id}"
+
+    @property
+    def module_id(self) -> int:
+        """
+        Returns the ecosystem module ID of the evaluator app (resolved once).
+        """
+        if self._module_id is None:
+            self._module_id = self.api.app.get_ecosystem_module_id(self.app_slug)
+        return self._module_id
+
+    @property
+    def sessions(self) -> List[int]:
+        """
+        Returns the known evaluator task IDs, most recently used first.
+        """
+        with self._lock:
+            return sorted(self._last_used, key=self._last_used.get, reverse=True)
+
+    def acquire(
+        self,
+        get_agent_id: Callable[[], int],
+        cancel_event: Optional[threading.Event] = None,
+        on_start: Optional[Callable[[Dict], None]] = None,
+    ) -> int:
+        """
+        Returns the task ID of a running evaluator session, starting one only if none is alive.
+
+        :param get_agent_id: returns the agent to start a new session on (called only if needed).
+        :param cancel_event: aborts waiting for a new session to start.
+        :param on_start: called with the task info of a newly started session.
+        """
+        with self._lock:
+            self._last_acquired_at = time.time()
+            self._get_agent_id = get_agent_id
+        self.start_maintenance()
+
+        task_id = self._find_alive_session()
+        if task_id is not None:
+            return task_id
+
+        with self._start_lock:
+            # another comparison may have started a session while we were waiting for the lock
+            task_id = self._find_alive_session(discover=False)
+            if task_id is not None:
+                return task_id
+            with self._lock:
+                self._starting += 1  # so the maintenance job doesn't start another one meanwhile
+            try:
+                return self._start_session(get_agent_id(), cancel_event, on_start)
+            finally:
+                with self._lock:
+                    self._starting -= 1
+
+    def is_healthy(self, task_id: int, force: bool = False) -> bool:
+        """
+        Checks that the session is still running. Results are reused for `health_check_interval`.
+        """
+        now = time.time()
+        with self._lock:
+            if not force and now - self._last_checked.get(task_id, 0) < self.health_check_interval:
+                return True
+        healthy = self.api.task.get_status(task_id) == self.api.task.Status.STARTED
+        with self._lock:
+            if healthy:
+                self._last_checked[task_id] = now
+            else:
+                self._forget(task_id)
+        return healthy
+
+    def maintain(self) -> None:
+        """
+        Health-checks the sessions, retires idle ones and keeps the warm pool filled while active.
+        """
+        now = time.time()
+        for task_id in self.sessions:
+            if not self.is_healthy(task_id, force=True):
+                sly.logger.info(f"Evaluator session {task_id} is not running anymore.")
+                continue
+            with self._lock:
+                idle = now - self._last_used.get(task_id, now)
+                owned = task_id in self._owned
+            if owned and idle > self.idle_timeout:
+                sly.logger.info(f"Retiring evaluator session {task_id} after {idle:.0f}s idle.")
+                self.api.task.stop(task_id)
+                with self._lock:
+                    self._forget(task_id)
+
+        with self._lock:
+            is_active = now - self._last_acquired_at < self.idle_timeout
+            missing = self.warm_size - len(self._last_used) - self._starting
+            get_agent_id = self._get_agent_id
+            if is_active and get_agent_id is not None:
+                self._starting += max(missing, 0)
+        if is_active and missing > 0 and get_agent_id is not None:
+            # not under the start lock: waiting for a warm session must not block `acquire`
+            for _ in range(missing):
+                try:
+                    self._start_session(get_agent_id())
+                except Exception:
+                    sly.logger.warning("Failed to start a warm evaluator session.", exc_info=True)
+                finally:
+                    with self._lock:
+                        self._starting -= 1
+        elif not is_active and not self.sessions:
+            self.stop_maintenance()
+
+    def start_maintenance(self) -> None:
+        scheduler = TasksScheduler()
+        if not scheduler.is_job_scheduled(self._job_id):
+            scheduler.add_job(
+                self.maintain,
+                interval=self.health_check_interval,
+                job_id=self._job_id,
+                replace_existing=True,
+            )
+
+    def stop_maintenance(self) -> None:
+        scheduler = TasksScheduler()
+        if scheduler.is_job_scheduled(self._job_id):
+            scheduler.remove_job(self._job_id)
+
+    def _find_alive_session(self, discover: bool = True) -> Optional[int]:
+        for task_id in self.sessions:
+            if self.is_healthy(task_id):
+                self._touch(task_id)
+                return task_id
+        if not discover:
+            return None
+        running = self.api.app.get_sessions(
+            self.team_id, self.module_id, statuses=[self.api.task.Status.STARTED]
+        )
+        if not running:
+            return None
+        with self._lock:
+            for session in running:
+                self._last_checked[session.task_id] = time.time()
+                self._last_used.setdefault(session.task_id, 0)
+        task_id = running[0].task_id
+        sly.logger.info(f"Model Benchmark Evaluator session {task_id} is already running.")
+        self._touch(task_id)
+        return task_id
+
+    def _start_session(
+        self,
+        agent_id: int,
+        cancel_event: Optional[threading.Event] = None,
+        on_start: Optional[Callable[[Dict], None]] = None,
+    ) -> int:
+        sly.logger.info("Starting Model Benchmark Evaluator task...")
+        task_info_json = self.api.task.start(
+            agent_id=agent_id,
+            app_id=None,
+            workspace_id=self.workspace_id,
+            description=f"Solutions: {self.api.task_id}",
+            module_id=self.module_id,
+        )
+        if task_info_json is None:
+            raise RuntimeError("Failed to start the evaluation task.")
+        if on_start is not None:
+            on_start(task_info_json)
+        task_id = task_info_json["taskId"]
+
+        readiness = None
+        try:
+            readiness = wait_for_task_ready(
+                self.api, task_id, deadline=self.start_timeout, cancel_event=cancel_event
+            )
+        finally:
+            if readiness is None or not readiness.ready:
+                # nothing would track a session that never became ready, so don't leak it
+                self._stop_session(task_id)
+        if readiness.ready:
+            with self._lock:
+                self._owned.add(task_id)
+                self._last_checked[task_id] = time.time()
+                self._touch(task_id)
+        if cancel_event is not None and cancel_event.is_set():
+            raise ComparisonCancelled("Cancelled while waiting for the evaluation task.")
+        if not readiness.ready:
+            raise RuntimeError(
+                f"Evaluation task {task_id} is not ready after {readiness.waited:.0f}s "
+                f"(status: {readiness.status})."
+            )
+        return task_id
+
+    def _stop_session(self, task_id: int) -> None:
+        try:
+            self.api.task.stop(task_id)
+            sly.logger.info(f"Stopped evaluator task {task_id} that did not start.")
+        except Exception:
+            sly.logger.warning(f"Failed to stop evaluator task {task_id}.", exc_info=True)
+
+    def _touch(self, task_id: int) -> None:
+        with self._lock:
+            self._last_used[task_id] = time.time()
+
+    def _forget(self, task_id: int) -> None:
+        self._last_used.pop(task_id, None)
+        self._last_checked.pop(task_id, None)
+        self._owned.discard(task_id)
+
+
+_session_managers: Dict[int, EvaluatorSessionManager] = {}
+_session_managers_lock = threading.Lock()
+
+
+def get_session_manager(
+    api: sly.Api, team_id: int, workspace_id: int, **kwargs
+) -> EvaluatorSessionManager:
+    """
+    Returns the evaluator session manager of the team, shared by all comparison nodes.
+    Keyword arguments configure the manager when it is created.
+    """
+    with _session_managers_lock:
+        if team_id not in _session_managers:
+            _session_managers[team_id] = EvaluatorSessionManager(
+                api, team_id, workspace_id, **kwargs
+            )
+        return _session_managers[team_id]
@@ -0,0 +1,159 @@
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from src.components.local_files import get_data_path, read_json, write_json
+from supervisely import logger
+
+
+class HistoryStore:
+    """
+    Append-only JSON Lines log of history rows with an offset index.
+
+    Every line is either a new row ({"op": "add", "row": {...}}) or a patch of an existing
+    row ({"op": "update", "id": ..., "fields": {...}}), so writes never rewrite the file.
+    The index maps row IDs to the offsets of their lines and is checkpointed to a sidecar
+    file, so startup only scans the lines written after the last checkpoint.
+    Rows are read lazily by seeking to their offsets, e.g. one page at a time.
+    """
+
+    CHECKPOINT_EVERY = 100  # lines
+
+    def __init__(self, name: str, path: Optional[str] = None):
+        self.path = path or get_data_path(os.path.join("history", f"{name}.jsonl"))
+        self.index_path = f"{self.path}.index.json"
+        self._order: List[str] = []
+        self._offsets: Dict[str, List[int]] = {}
+        self._size = 0
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        self._load_index()
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, row_id: str) -> bool:
+        return row_id in self._offsets
+
+    def append(self, row: Dict[str, Any]) -> str:
+        """
+        Adds the row and returns its ID. Rows without an "id" get the next sequential one.
+        """
+        with self._lock:
+            if row.get("id") is None:
+                seq = len(self._order) + 1
+                while str(seq) in self._offsets:  # skipped corrupted rows leave gaps
+                    seq += 1
+                row = {**row, "id": str(seq)}
+            self._write({"op": "add", "row": row})
+            return row["id"]
+
+    def update(self, row_id: str, fields: Dict[str, Any]) -> None:
+        """
+        Updates the fields of the row by appending a patch line.
+        """
+        with self._lock:
+            if row_id not in self._offsets:
+                raise KeyError(f"Row {row_id} not found in {self.path}.")
+            self._write({"op": "update", "id": row_id, "fields": fields})
+
+    def get(self, row_id: str) -> Dict[str, Any]:
+        with self._lock:
+            offsets = list(self._offsets[row_id])
+        with open(self.path, "rb") as f:
+            return self._read_row(f, offsets)
+
+    def read_page(
+        self, page: int = 0, page_size: int = 50, newest_first: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns one page of rows. Only the lines of these rows are read from disk.
+        """
+        with self._lock:
+            ids = self._order[::-1] if newest_first else self._order
+            ids = ids[page * page_size : (page + 1) * page_size]
+            offsets = [list(self._offsets[row_id]) for row_id in ids]
+        if not offsets:
+            return []
+        with open(self.path, "rb") as f:
+            return [self._read_row(f, row_offsets) for row_offsets in offsets]
+
+    def save_index(self) -> None:
+        """
+        Checkpoints the offset index, so the next startup doesn't need to scan the whole log.
+        """
+        with self._lock:
+            self._save_index()
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        with open(self.path, "ab") as f:
+            f.write(line)
+        self._index(record, self._size)
+        self._size += len(line)
+        self._unsaved += 1
+        if self._unsaved >= self.CHECKPOINT_EVERY:
+            self._save_index()
+
+    def _index(self, record: Dict[str, Any], offset: int) -> None:
+        if record["op"] == "add":
+            row_id = record["row"]["id"]
+            if row_id not in self._offsets:
+                self._order.append(row_id)
+            self._offsets[row_id] = [offset]
+        elif record["id"] in self._offsets:
+            self._offsets[record["id"]].append(offset)
+
+    @staticmethod
+    def _read_row(f, offsets: List[int]) -> Dict[str, Any]:
+        f.seek(offsets[0])
+        row = json.loads(f.readline())["row"]
+        for offset in offsets[1:]:
+            f.seek(offset)
+            row.update(json.loads(f.readline())["fields"])
+        return row
+
+    def _save_index(self) -> None:
+        index = {"size": self._size, "order": self._order, "offsets": self._offsets}
+        write_json(self.index_path, index)
+        self._unsaved = 0
+
+    def _load_index(self) -> None:
+        if not os.path.isfile(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            return
+        file_size = os.path.getsize(self.path)
+        index = read_json(self.index_path, default={})
+        if index and index["size"] <= file_size:
+            self._order, self._offsets, self._size = index["order"], index["offsets"], index["size"]
+        self._scan()
+
+    def _scan(self) -> None:
+        """
+        Indexes the lines written after the last checkpoint.
+        A partially written last line (e.g. after a crash) is truncated, corrupted lines
+        in the middle of the log are skipped.
+        """
+        scanned = 0
+        with open(self.path, "rb+") as f:
+            f.seek(self._size)
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                if not line.endswith(b"\n"):
+                    logger.warning(f"Truncating an incomplete last line of {self.path}.")
+                    f.truncate(offset)
+                    break
+                self._size = f.tell()
+                try:
+                    self._index(json.loads(line), offset)
+                except (ValueError, KeyError, TypeError):
+                    logger.warning(f"Skipping a corrupted line at offset {offset} of {self.path}.")
+                    continue
+                scanned += 1
+        if scanned:
+            logger.debug(f"Indexed {scanned} new lines of {self.path}.")
+            self._save_index()
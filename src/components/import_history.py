@@ -0,0 +1,110 @@
+import itertools
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import supervisely as sly
+from src.components.history_store import HistoryStore
+
+
+class ImportHistoryIndex:
+    """
+    In-memory index of the project's import history, keyed by task ID.
+
+    The import nodes append their tasks to `custom_data["import_history"]["tasks"]`.
+    `refresh` reads only the custom data (not the whole project info) and walks the list
+    from the end, stopping at the first entry that is already indexed and unchanged, so the
+    cost of a refresh depends on the number of new imports, not on the history size.
+
+    `compact` keeps only the latest `keep` entries in the custom data and moves the older
+    ones to a local archive, so the project custom data stays small. It runs only once the
+    history has grown to twice `keep`, so most imports don't rewrite the custom data.
+    """
+
+    def __init__(self, api: sly.Api, project_id: int, keep: int = 100):
+        self.api = api
+        self.project_id = project_id
+        self.keep = keep
+        self.archive = HistoryStore(f"import_history_{project_id}")
+        self._tasks: OrderedDict[Any, Dict[str, Any]] = OrderedDict()
+        self._stored_count: Optional[int] = None  # entries in custom data at the last refresh
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()  # one read-merge-write of custom data at a time
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __contains__(self, task_id) -> bool:
+        return task_id in self._tasks
+
+    def get(self, task_id) -> Optional[Dict[str, Any]]:
+        """
+        Returns the history entry of the import task, looking in the archive if needed.
+        """
+        entry = self._tasks.get(task_id)
+        if entry is None and str(task_id) in self.archive:
+            entry = self.archive.get(str(task_id))
+        return entry
+
+    def latest(self, n: int = 10) -> List[Dict[str, Any]]:
+        """
+        Returns the latest `n` imports, newest first.
+        """
+        with self._lock:
+            return [self._tasks[task_id] for task_id in itertools.islice(reversed(self._tasks), n)]
+
+    def refresh(self) -> int:
+        """
+        Indexes new and updated entries of the import history. Returns their number.
+        """
+        tasks = self._get_history_tasks(self.api.project.get_custom_data(self.project_id))
+        self._stored_count = len(tasks)
+        new_entries = []
+        for entry in reversed(tasks):
+            if self._tasks.get(entry.get("task_id")) == entry:
+                break
+            new_entries.append(entry)
+        with self._lock:
+            for entry in reversed(new_entries):
+                self._tasks[entry.get("task_id")] = entry
+                self._tasks.move_to_end(entry.get("task_id"))
+        return len(new_entries)
+
+    def compact(self) -> int:
+        """
+        Moves all but the latest `keep` entries from the project custom data to the local
+        archive, where `get` still finds them, once there are more than `2 * keep` of them.
+        Returns the number of archived entries.
+
+        Only the import history is changed: the custom data is re-read right before the
+        update and the archived entries are removed from the fresh copy, so entries and
+        other keys written in between are kept. An entry written by an import task between
+        the read and the update is still lost, so call it only when no imports are running.
+        """
+        if self._stored_count is not None and self._stored_count <= 2 * self.keep:
+            return 0
+        with self._compact_lock:
+            tasks = self._get_history_tasks(self.api.project.get_custom_data(self.project_id))
+            if len(tasks) <= 2 * self.keep:
+                self._stored_count = len(tasks)
+                return 0
+            old = tasks[: -self.keep]
+            for entry in old:
+                self.archive.append({**entry, "id": str(entry.get("task_id"))})
+            archived = {entry.get("task_id") for entry in old}
+
+            custom_data = self.api.project.get_custom_data(self.project_id) or {}
+            history = custom_data.setdefault("import_history", {})
+            recent = [e for e in history.get("tasks", []) if e.get("task_id") not in archived]
+            history["tasks"] = recent
+            self.api.project.update_custom_data(self.project_id, custom_data)
+            self._stored_count = len(recent)
+        sly.logger.info(
+            f"Archived {len(old)} import history entries of project {self.project_id}.",
+            extra={"archive": self.archive.path},
+        )
+        return len(old)
+
+    @staticmethod
+    def _get_history_tasks(custom_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return (custom_data or {}).get("import_history", {}).get("tasks", [])
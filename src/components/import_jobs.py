@@ -0,0 +1,140 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+
+import supervisely as sly
+
+
+class ImportJob:
+    """
+    A single cloud import tracked in the background.
+    """
+
+    class Status:
+        QUEUED = "queued"
+        RUNNING = "running"
+        FINISHED = "finished"
+        FAILED = "failed"
+
+    FINAL_STATUSES = (Status.FINISHED, Status.FAILED)
+
+    def __init__(
+        self, path: Optional[str] = None, keys: Optional[List[str]] = None, group: Any = None
+    ):
+        self.id = uuid4().hex
+        self.path = path
+        self.keys = keys  # the objects under the path to import, None for all of them
+        self.group = group  # e.g. the sharded import the job is a part of
+        self.status = self.Status.QUEUED
+        self.task_id: Optional[int] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.future: Optional[Future] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in self.FINAL_STATUSES
+
+    def set_status(self, status: str, error: Optional[str] = None) -> None:
+        self.status = status
+        if error is not None:
+            self.error = error
+        if self.is_finished:
+            self.finished_at = time.time()
+
+    def __repr__(self) -> str:
+        return f"ImportJob(id={self.id}, status={self.status}, path={self.path})"
+
+
+class ImportJobManager:
+    """
+    Runs imports in a background pool, at most `max_concurrent` at a time, and calls the
+    registered callbacks when each of them completes.
+
+    `start_fn(path, keys)` starts the import task and returns its ID, `wait_fn(task_id)` blocks
+    until the task is done. Both run in the pool, so button handlers and automation jobs
+    return immediately. Callbacks get the job in its final status, FINISHED or FAILED.
+    An import of a path that is already queued or running is not started twice.
+    Slow preparation of imports (e.g. listing the storage) runs in a separate background
+    thread via `run_in_background`, so it never waits for a free import slot.
+    """
+
+    def __init__(
+        self,
+        start_fn: Callable[[Optional[str], Optional[List[str]]], int],
+        wait_fn: Callable[[int], None],
+        max_concurrent: int = 2,
+    ):
+        self.start_fn = start_fn
+        self.wait_fn = wait_fn
+        self.executor = ThreadPoolExecutor(max_concurrent, thread_name_prefix="import_job")
+        self._planner = ThreadPoolExecutor(1, thread_name_prefix="import_planner")
+        self._jobs: Dict[str, ImportJob] = {}
+        self._jobs_lock = threading.Lock()
+        self._callbacks: List[Callable[[ImportJob], None]] = []
+        self._callbacks_lock = threading.Lock()  # downstream updates run one at a time
+
+    @property
+    def active_jobs(self) -> List[ImportJob]:
+        with self._jobs_lock:
+            return list(self._jobs.values())
+
+    def submit(
+        self, path: Optional[str] = None, keys: Optional[List[str]] = None, group: Any = None
+    ) -> ImportJob:
+        """
+        Queues an import of the path (only of its `keys`, if given) and returns its job
+        immediately. The job is created with its `group` before it starts, so callbacks always
+        see it. If the same import is already queued or running, the existing job is returned,
+        which may belong to another group.
+        """
+        with self._jobs_lock:
+            for job in self._jobs.values():
+                if job.path == path and job.keys == keys and path is not None:
+                    sly.logger.info(f"Import of '{path}' is already {job.status}.")
+                    return job
+            job = ImportJob(path, keys, group)
+            self._jobs[job.id] = job
+        job.future = self.executor.submit(self._run, job)
+        sly.logger.info(f"Import job {job.id} is queued.", extra={"path": path})
+        return job
+
+    def on_complete(self, fn: Callable[[ImportJob], None]):
+        """
+        Decorator to register a callback called with the job when an import finishes or fails.
+        """
+        self._callbacks.append(fn)
+        return fn
+
+    def run_in_background(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Runs the preparation of an import in the background thread.
+        """
+        return self._planner.submit(fn, *args, **kwargs)
+
+    def shutdown(self) -> None:
+        self._planner.shutdown(wait=False, cancel_futures=True)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: ImportJob) -> None:
+        try:
+            job.set_status(ImportJob.Status.RUNNING)
+            job.task_id = self.start_fn(job.path, job.keys)
+            sly.logger.info(f"Import job {job.id} started task {job.task_id}.")
+            self.wait_fn(job.task_id)
+            job.set_status(ImportJob.Status.FINISHED)
+        except Exception as e:
+            sly.logger.error(f"Import job {job.id} failed.", exc_info=True)
+            job.set_status(ImportJob.Status.FAILED, error=str(e))
+        finally:
+            with self._jobs_lock:
+                self._jobs.pop(job.id, None)
+        with self._callbacks_lock:
+            for fn in self._callbacks:
+                try:
+                    fn(job)
+                except Exception:
+                    sly.logger.error("Import completion callback failed.", exc_info=True)
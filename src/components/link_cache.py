@@ -0,0 +1,137 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import supervisely as sly
+from src.components.local_files import get_data_path, read_json, write_json
+from src.components.remote_files import read_remote_text
+
+
+class LinkCache:
+    """
+    In-memory LRU cache of report URLs resolved from `.lnk` files in Team Files,
+    persisted to a JSON file in the app data directory.
+
+    Link files are written once by the benchmark app, so every file is fetched once
+    and then served from memory (or from disk after a restart) until its TTL expires.
+    """
+
+    def __init__(
+        self,
+        ttl: int = 30 * 24 * 60 * 60,
+        max_size: int = 1024,
+        cache_path: Optional[str] = None,
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.cache_path = cache_path or get_data_path("lnk_cache.json")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Tuple[int, str], Tuple[str, float]] = OrderedDict()
+        self._lock = threading.RLock()
+        self._load()
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns the hit/miss counters of the cache.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def get_url(
+        self, api: sly.Api, team_id: int, remote_lnk_path: str, check_exists: bool = True
+    ) -> str:
+        """
+        Returns the absolute report URL stored in the `.lnk` file.
+        Returns an empty string if the file does not exist.
+        Pass `check_exists=False` if the file is already known to exist (e.g. from a listing).
+        """
+        key = (team_id, remote_lnk_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[1] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return sly.utils.abs_url(entry[0])
+            self.misses += 1
+
+        if check_exists and not api.file.exists(team_id, remote_lnk_path):
+            sly.logger.warning(
+                f"Link file {remote_lnk_path} does not exist in the benchmark directory."
+            )
+            return ""
+        base_url = read_remote_text(api, team_id, remote_lnk_path).strip()
+        self._put(key, base_url)
+        return sly.utils.abs_url(base_url)
+
+    def invalidate(self, team_id: Optional[int] = None, remote_lnk_path: Optional[str] = None):
+        """
+        Removes matching entries from the cache. Without arguments, clears the whole cache.
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if team_id is not None and key[0] != team_id:
+                    continue
+                if remote_lnk_path is not None and key[1] != remote_lnk_path:
+                    continue
+                del self._entries[key]
+            self._dump()
+
+    def _put(self, key: Tuple[int, str], base_url: str):
+        with self._lock:
+            self._entries[key] = (base_url, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._dump()
+
+    def _load(self):
+        entries = read_json(self.cache_path, [])
+        if not isinstance(entries, list):
+            sly.logger.warning(f"Ignoring the link cache {self.cache_path}: not a list.")
+            return
+        now = time.time()
+        skipped = 0
+        for entry in entries[-self.max_size :]:
+            try:
+                team_id, path, base_url, fetched_at = entry
+                if not isinstance(path, str) or not isinstance(base_url, str):
+                    raise TypeError("path and URL must be strings")
+                expired = now - float(fetched_at) >= self.ttl
+                key = (int(team_id), path)
+            except (TypeError, ValueError):
+                skipped += 1
+                continue
+            if not expired:
+                self._entries[key] = (base_url, float(fetched_at))
+        if skipped:
+            sly.logger.warning(f"Skipped {skipped} malformed entries of the link cache.")
+
+    def _dump(self):
+        write_json(self.cache_path, [[*key, *value] for key, value in self._entries.items()])
+
+
+_link_cache = None
+_link_cache_lock = threading.Lock()
+
+
+def get_link_cache() -> LinkCache:
+    """
+    Returns the link cache shared by all solution nodes.
+    """
+    global _link_cache
+    with _link_cache_lock:
+        if _link_cache is None:
+            _link_cache = LinkCache()
+        return _link_cache
@@ -0,0 +1,40 @@
+import json
+import os
+from typing import Any
+
+import supervisely as sly
+
+
+def get_data_path(filename: str) -> str:
+    """
+    Returns the path of a file in the app data directory.
+    """
+    return os.path.join(sly.app.get_data_dir(), filename)
+
+
+def read_json(path: str, default: Any = None) -> Any:
+    """
+    Reads a local JSON file. Returns `default` if the file is missing or corrupted.
+    """
+    if not os.path.isfile(path):
+        return default
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        sly.logger.warning(f"Failed to read {path}.", exc_info=True)
+        return default
+
+
+def write_json(path: str, data: Any) -> None:
+    """
+    Writes a local JSON file atomically, so readers never see a partially written file.
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        sly.fs.ensure_base_path(path)
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        sly.logger.warning(f"Failed to save {path}.", exc_info=True)
@@ -0,0 +1,72 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+import supervisely as sly
+
+
+class NodeRegistry:
+    """
+    Registry of solution graph nodes that are constructed in a background pool.
+
+    Node factories are submitted on registration, so API-backed constructors run concurrently
+    and the graph is ready as soon as the slowest node is built, not after all of them in a row.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="solution_node")
+        self._futures: Dict[str, Future] = {}
+        self._timings: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable, *args, **kwargs) -> None:
+        """
+        Registers a node factory and starts building the node in the background.
+        """
+        if name in self._futures:
+            raise KeyError(f"Node '{name}' is already registered.")
+        self._futures[name] = self._executor.submit(self._build, name, factory, *args, **kwargs)
+
+    def get(self, name: str) -> Any:
+        """
+        Returns the node by name, waiting for its construction if it is still in progress.
+        """
+        if name not in self._futures:
+            raise KeyError(f"Node '{name}' is not registered.")
+        return self._futures[name].result()
+
+    def __getitem__(self, name: str) -> Any:
+        return self.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._futures
+
+    @property
+    def names(self) -> List[str]:
+        """
+        Returns the names of the registered nodes in registration order.
+        """
+        return list(self._futures)
+
+    @property
+    def timings(self) -> Dict[str, float]:
+        """
+        Returns the construction time of each built node in seconds.
+        """
+        with self._lock:
+            return dict(self._timings)
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _build(self, name: str, factory: Callable, *args, **kwargs) -> Any:
+        start = time.perf_counter()
+        try:
+            return factory(*args, **kwargs)
+        except Exception:
+            sly.logger.error(f"Failed to build solution node '{name}'.", exc_info=True)
+            raise
+        finally:
+            with self._lock:
+                self._timings[name] = time.perf_counter() - start
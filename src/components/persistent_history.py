@@ -0,0 +1,184 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+
+from src.components.history_store import HistoryStore
+from supervisely.app.widgets import Container, Pagination
+from supervisely.app.widgets.tasks_history.tasks_history import TasksHistory
+
+
+class PersistentHistory(TasksHistory):
+    """
+    History widget backed by a local HistoryStore instead of DataJson.
+
+    Rows survive app restarts, and the table only holds the current page,
+    so neither startup nor updates depend on the size of the whole history.
+    Single rows are added, updated and trimmed in place, so only the change
+    reaches the frontend instead of the whole table.
+    """
+
+    PAGE_SIZE = 50  # also the max number of rows kept in the table
+
+    def __init__(
+        self,
+        name: str,
+        columns: List[str],
+        columns_keys: List[List[str]],
+        widget_id: str = None,
+    ):
+        self.store = HistoryStore(name)
+        self.page = 0
+        # visible rows by ID (top row first) and their insertion sequence numbers
+        self._rows: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self._seq: Dict[str, int] = {}
+        self._top_seq = -1
+        self._dirty: Set[str] = set()
+        self._lock = threading.RLock()  # rows are also updated from the email outbox worker
+        super().__init__(widget_id=widget_id)
+        self._remove_unused_args()
+        self._table_columns = columns
+        self._columns_keys = columns_keys
+        if self.count > 0:
+            self.update()
+
+    @property
+    def count(self) -> int:
+        """
+        Returns the total number of rows in the history.
+        """
+        return len(self.store)
+
+    def get_tasks(self) -> List[Dict[str, Any]]:
+        """
+        Returns the rows of the current page, newest first.
+        """
+        return self.store.read_page(self.page, self.PAGE_SIZE)
+
+    def set_page(self, page: int) -> None:
+        """
+        Shows the page of the history (0-based, newest rows first).
+        """
+        self.page = max(0, min(page, (self.count - 1) // self.PAGE_SIZE))
+        self.update()
+
+    @property
+    def pager(self) -> Pagination:
+        """
+        Returns the pager that switches the pages of the table.
+        """
+        if not hasattr(self, "_pager"):
+            self._pager = Pagination(
+                total=self.count,
+                page_size=self.PAGE_SIZE,
+                layout="prev, pager, next, ->, total",
+                page_size_options=[self.PAGE_SIZE],
+            )
+
+            @self._pager.page_changed
+            def _on_page_changed(page: int):
+                self.set_page(page - 1)
+
+        return self._pager
+
+    @property
+    def content(self) -> Container:
+        """
+        Returns the table with its pager, to be shown in a modal.
+        """
+        if not hasattr(self, "_content"):
+            self._content = Container([self, self.pager])
+        return self._content
+
+    def add_task(self, task: Dict[str, Any]) -> str:
+        """
+        Appends the row to the store and returns its ID.
+        """
+        if hasattr(task, "to_json"):
+            task = task.to_json()
+        with self._lock:
+            row_id = self.store.append(task)
+            if hasattr(self, "_pager"):
+                self._pager.set_total(self.count)
+            if self.page == 0:
+                self._insert_top({**task, "id": row_id})
+                self._trim()
+        return row_id
+
+    def update_task(self, row_id: str, fields: Dict[str, Any]) -> None:
+        """
+        Updates the fields of the row by its ID. Only this row is redrawn, if it is visible.
+        """
+        with self._lock:
+            self.store.update(row_id, fields)
+            row = self._rows.get(row_id)
+            if row is not None:
+                row.update(fields)
+                self._dirty.add(row_id)
+                self._flush_dirty()
+
+    def update(self):
+        """
+        Reloads the whole current page. Used on startup and when the page changes.
+        """
+        with self._lock:
+            self.table.clear()
+            tasks = self.get_tasks()
+            self._rows = OrderedDict((task["id"], task) for task in tasks)
+            self._top_seq = len(tasks) - 1
+            self._seq = {task["id"]: self._top_seq - i for i, task in enumerate(tasks)}
+            self._dirty.clear()
+            for task in tasks:
+                self.table.insert_row(self._get_row(task))
+
+    def _position(self, row_id: str) -> int:
+        # rows are only inserted at the top and removed from the bottom,
+        # so the position follows from the insertion sequence number
+        return self._top_seq - self._seq[row_id]
+
+    def _insert_top(self, task: Dict[str, Any]) -> None:
+        self._top_seq += 1
+        self._seq[task["id"]] = self._top_seq
+        self._rows[task["id"]] = task
+        self._rows.move_to_end(task["id"], last=False)
+        self.table.insert_row(self._get_row(task), index=0)
+
+    def _flush_dirty(self) -> None:
+        """
+        Redraws the rows marked as dirty.
+        """
+        for row_id in self._dirty:
+            if row_id not in self._rows:
+                continue
+            idx = self._position(row_id)
+            self.table.pop_row(idx)
+            self.table.insert_row(self._get_row(self._rows[row_id]), index=idx)
+        self._dirty.clear()
+
+    def _trim(self) -> None:
+        """
+        Removes the oldest rows beyond PAGE_SIZE from the table. They stay in the store.
+        """
+        while len(self._rows) > self.PAGE_SIZE:
+            row_id, _ = self._rows.popitem(last=True)
+            del self._seq[row_id]
+            self.table.pop_row(len(self._rows))
+
+    def _get_row(self, task: Dict[str, Any]) -> List[Optional[Any]]:
+        return [task.get(keys[0]) for keys in self._columns_keys]
+
+    def _remove_unused_args(self):
+        """
+        Removes unused arguments from the class to avoid confusion.
+        """
+        unused_args = [
+            "api",
+            "_stop_autorefresh",
+            "_refresh_thread",
+            "_refresh_interval",
+            "_autorefresh",
+            "stop_autorefresh",
+            "start_autorefresh",
+        ]
+        for arg in unused_args:
+            if hasattr(self, arg):
+                delattr(self, arg)
@@ -0,0 +1,74 @@
+import threading
+from concurrent.futures import Future
+from typing import Dict, Tuple
+
+import supervisely as sly
+from supervisely.api.module_api import ApiField
+
+MAX_ARTIFACT_SIZE = 16 * 1024 * 1024  # 16 MB
+CHUNK_SIZE = 256 * 1024
+
+_inflight: Dict[Tuple[int, str], Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def read_remote_bytes(
+    api: sly.Api, team_id: int, remote_path: str, max_size: int = MAX_ARTIFACT_SIZE
+) -> bytes:
+    """
+    Streams a small file from Team Files straight into memory.
+
+    Safe to call from many threads: no local files are used, and concurrent reads
+    of the same file share a single download.
+    """
+    key = (team_id, remote_path)
+    with _inflight_lock:
+        future = _inflight.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = Future()
+            _inflight[key] = future
+    if not is_owner:
+        return future.result()
+
+    try:
+        data = _download(api, team_id, remote_path, max_size)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(data)
+        return data
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def read_remote_text(
+    api: sly.Api,
+    team_id: int,
+    remote_path: str,
+    encoding: str = "utf-8",
+    max_size: int = MAX_ARTIFACT_SIZE,
+) -> str:
+    """
+    Reads a text file (e.g. `.lnk` or markdown) from Team Files into memory.
+    """
+    return read_remote_bytes(api, team_id, remote_path, max_size).decode(encoding)
+
+
+def _download(api: sly.Api, team_id: int, remote_path: str, max_size: int) -> bytes:
+    buffer = bytearray()
+    response = api.post(
+        "file-storage.download",
+        {ApiField.TEAM_ID: team_id, ApiField.PATH: remote_path},
+        stream=True,
+    )
+    with response:
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            buffer.extend(chunk)
+            if len(buffer) > max_size:
+                raise ValueError(
+                    f"Remote file {remote_path} exceeds the size limit of {max_size} bytes."
+                )
+    return bytes(buffer)
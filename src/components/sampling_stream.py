@@ -0,0 +1,108 @@
+import threading
+from typing import Callable, Iterable, List, Optional, Set
+
+import supervisely as sly
+from src.components.collection_add import CollectionAddResult, add_to_collection
+
+DEFAULT_POLL_INTERVAL = 3  # seconds
+
+
+class SampledImageStream:
+    """
+    Adds the images copied by a running sampling to the labeling collection as they appear,
+    instead of after the whole sample is copied.
+
+    The sampling copies images into the labeling project in one blocking call, so the stream
+    polls the project in the background for images with IDs above the largest ID seen before
+    the sampling started (IDs only grow) and adds every new batch with one parallel
+    `add_to_collection` call. Only images of the datasets created during the sampling (its
+    destination datasets) are streamed; `add_remaining` then adds the sampled images that
+    the polls missed, e.g. those copied into datasets that already existed.
+    """
+
+    def __init__(
+        self,
+        api: sly.Api,
+        project_id: int,
+        collection_id: int,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        on_added: Optional[Callable[[int, int], None]] = None,
+    ):
+        self.api = api
+        self.project_id = project_id
+        self.collection_id = collection_id
+        self.poll_interval = poll_interval
+        self.on_added = on_added  # called after every batch with the totals (added, failed)
+        self.added = 0
+        self.failed: List[int] = []
+        self._seen: Set[int] = set()
+        self._last_id = 0
+        self._known_datasets: Set[int] = set()  # datasets that existed before the sampling
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        last = self.api.image.get_list(
+            project_id=self.project_id,
+            recursive=True,
+            sort="id",
+            sort_order="desc",
+            limit=1,
+            fields=["id"],
+        )
+        self._last_id = last[0].id if last else 0
+        datasets = self.api.dataset.get_list(self.project_id, recursive=True)
+        self._known_datasets = {dataset.id for dataset in datasets}
+        self._thread = threading.Thread(target=self._run, name="sampled_images", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops polling, waiting for the current poll to finish.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def add_remaining(self, image_ids: Iterable[int]) -> CollectionAddResult:
+        """
+        Adds the sampled images that were not streamed yet. Returns the totals of the stream.
+        """
+        self.stop()
+        self._add(image_ids)
+        self._seen = set()  # nothing is added after this, no need to keep the IDs
+        return CollectionAddResult(self.added, self.failed)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self._poll()
+            except Exception:
+                sly.logger.warning("Failed to poll the labeling project.", exc_info=True)
+
+    def _poll(self) -> None:
+        filters = [{"field": "id", "operator": ">", "value": self._last_id}]
+        images = self.api.image.get_list(
+            project_id=self.project_id,
+            recursive=True,
+            filters=filters,
+            sort="id",
+            fields=["id", "datasetId"],
+        )
+        if not images:
+            return
+        self._last_id = max(image.id for image in images)
+        self._add(image.id for image in images if image.dataset_id not in self._known_datasets)
+
+    def _add(self, image_ids: Iterable[int]) -> None:
+        with self._lock:
+            ids = [image_id for image_id in image_ids if image_id not in self._seen]
+            if not ids:
+                return
+            self._seen.update(ids)
+            result = add_to_collection(self.api, self.collection_id, ids)
+            self.added += result.added
+            self.failed.extend(result.failed)
+            if self.on_added is not None:
+                self.on_added(self.added, len(self.failed))
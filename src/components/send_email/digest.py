@@ -0,0 +1,104 @@
+import datetime
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from src.components.local_files import get_data_path, read_json, write_json
+from supervisely import logger
+
+
+class DigestBuffer:
+    """
+    Buffer of notification events that are sent together as one digest email.
+
+    Events are kept in memory and mirrored to a JSON file, so a restart does not lose them.
+    The buffer is flushed when its oldest event is older than `window` seconds (see `check`)
+    or when it holds `max_items` events, so the number of emails does not depend on how
+    often events happen.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        on_flush: Callable[[List[Dict[str, Any]]], None],
+        window: int = 3600,
+        max_items: int = 20,
+        path: Optional[str] = None,
+    ):
+        self.on_flush = on_flush
+        self.window = window
+        self.max_items = max_items
+        self.path = path or get_data_path(f"digest_{name}.json")
+        self._events: List[Dict[str, Any]] = read_json(self.path, default=[])
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._events)
+
+    def add(self, event: Dict[str, Any]) -> None:
+        """
+        Buffers the event and flushes the buffer if it is full.
+        """
+        event = {"timestamp": time.time(), **event}
+        with self._lock:
+            self._events.append(event)
+            write_json(self.path, self._events)
+            is_full = len(self._events) >= self.max_items
+        if is_full:
+            self.flush()
+
+    def is_due(self) -> bool:
+        """
+        Returns True if the oldest buffered event has waited for the whole window.
+        """
+        with self._lock:
+            return bool(self._events) and time.time() - self._events[0]["timestamp"] >= self.window
+
+    def check(self) -> None:
+        """
+        Flushes the buffer if it is due. Meant to be called periodically by the scheduler.
+        """
+        if self.is_due():
+            self.flush()
+
+    def flush(self, on_flush: Optional[Callable[[List[Dict[str, Any]]], None]] = None) -> int:
+        """
+        Passes all buffered events to `on_flush` (the one given in the constructor by default)
+        and returns their number. If it fails, the events are put back for the next flush.
+        """
+        on_flush = on_flush or self.on_flush
+        with self._lock:
+            events, self._events = self._events, []
+            write_json(self.path, self._events)
+        if not events:
+            return 0
+        try:
+            on_flush(events)
+        except Exception:
+            logger.error(f"Failed to send a digest of {len(events)} events.", exc_info=True)
+            with self._lock:
+                self._events = events + self._events
+                write_json(self.path, self._events)
+            return 0
+        logger.info(f"Sent a digest of {len(events)} events.")
+        return len(events)
+
+    @staticmethod
+    def format_events(events: List[Dict[str, Any]]) -> str:
+        """
+        Renders the events as a plain text list for the email body.
+        """
+        lines = []
+        for event in events:
+            created_at = datetime.datetime.fromtimestamp(event["timestamp"])
+            lines.append(f"[{created_at:%Y-%m-%d %H:%M:%S}] {event.get('message', '')}")
+            if event.get("link"):
+                lines.append(f"    Link: {event['link']}")
+            if event.get("best_checkpoint"):
+                lines.append(f"    Best checkpoint: {event['best_checkpoint']}")
+        return "\n".join(lines)
@@ -0,0 +1,113 @@
+import base64
+import math
+import mimetypes
+import os
+import re
+from email import policy
+from email.message import EmailMessage
+from typing import Iterator, List, Optional, Tuple
+from uuid import uuid4
+
+import supervisely as sly
+
+MAX_ATTACHMENTS_SIZE = 10 * 1024 * 1024  # 10 MB, most providers reject larger messages
+TEAM_FILES_ATTACHMENTS_DIR = "/solutions/email-attachments"
+# 57 raw bytes make one 76-character base64 line, so every block is encoded to whole lines
+BASE64_BLOCK_SIZE = 57 * 1024
+
+
+def iter_message_chunks(
+    sender: str,
+    to_addrs: List[str],
+    subject: str,
+    body: str,
+    attachments: Optional[List[str]] = None,
+) -> Iterator[bytes]:
+    """
+    Yields the MIME message in SMTP wire format (CRLF line endings, dot-stuffed).
+
+    Attachments are read and base64-encoded block by block, so memory use does not depend
+    on attachment sizes.
+    """
+    boundary = f"==============={uuid4().hex}=="
+    headers = EmailMessage()
+    headers["Subject"] = subject
+    headers["From"] = sender
+    headers["To"] = ", ".join(to_addrs)
+    headers["MIME-Version"] = "1.0"
+    headers["Content-Type"] = f'multipart/mixed; boundary="{boundary}"'
+    yield _fold_headers(headers) + b"\r\n"
+
+    text = EmailMessage()
+    text.set_content(body)
+    text_bytes = text.as_bytes(policy=policy.SMTP)
+    yield f"--{boundary}\r\n".encode() + re.sub(rb"(?m)^\.", b"..", text_bytes) + b"\r\n"
+
+    for path in attachments or []:
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Attachment not found: {path}")
+        ctype, encoding = mimetypes.guess_type(path)
+        part = EmailMessage()
+        part["Content-Type"] = ctype or "application/octet-stream"
+        part["Content-Transfer-Encoding"] = "base64"
+        part.add_header("Content-Disposition", "attachment", filename=os.path.basename(path))
+        yield f"--{boundary}\r\n".encode() + _fold_headers(part) + b"\r\n"
+        with open(path, "rb") as fp:
+            while block := fp.read(BASE64_BLOCK_SIZE):
+                yield base64.encodebytes(block).replace(b"\n", b"\r\n")
+
+    yield f"--{boundary}--\r\n".encode()
+
+
+def fit_attachments(
+    attachments: List[str],
+    body: str,
+    budget: int = MAX_ATTACHMENTS_SIZE,
+    api: Optional[sly.Api] = None,
+    team_id: Optional[int] = None,
+) -> Tuple[List[str], str]:
+    """
+    Keeps attachments within the total size budget (in the given order). The budget applies
+    to the base64-encoded size, i.e. what the attachments add to the message.
+
+    Files that do not fit are uploaded to Team Files and linked in the body instead.
+    Without `api` and `team_id` they are only listed in the body as not attached.
+    Returns the attachments to send and the updated body.
+    """
+    attached, overflow, total = [], [], 0
+    for path in attachments:
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Attachment not found: {path}")
+        size = encoded_size(os.path.getsize(path))
+        if total + size <= budget:
+            attached.append(path)
+            total += size
+        else:
+            overflow.append(path)
+    if not overflow:
+        return attached, body
+
+    sly.logger.info(f"{len(overflow)} attachments exceed the {budget} bytes budget.")
+    lines = []
+    for path in overflow:
+        name = os.path.basename(path)
+        if api is None or team_id is None:
+            lines.append(f"- {name} (not attached: too large)")
+            continue
+        remote_path = f"{TEAM_FILES_ATTACHMENTS_DIR}/{uuid4().hex[:8]}_{name}"
+        file_info = api.file.upload(team_id, path, remote_path)
+        lines.append(f"- {name}: {file_info.full_storage_url}")
+    body = f"{body}\n\nSome files were too large to attach:\n" + "\n".join(lines)
+    return attached, body
+
+
+def encoded_size(size: int) -> int:
+    """
+    Returns the size of `size` bytes encoded to base64 lines of 76 characters with CRLF.
+    """
+    encoded = 4 * math.ceil(size / 3)
+    return encoded + 2 * math.ceil(encoded / 76)
+
+
+def _fold_headers(msg: EmailMessage) -> bytes:
+    return b"".join(policy.SMTP.fold_binary(name, value) for name, value in msg.items())
@@ -0,0 +1,318 @@
+import os
+import smtplib
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from src.components.local_files import get_data_path, read_json, write_json
+from src.components.send_email.mime_stream import fit_attachments, iter_message_chunks
+from src.components.send_email.send_email import (
+    DEFAULT_SMTP_RATE_LIMIT,
+    SMTP_RATE_LIMITS,
+    SendEmail,
+)
+from src.components.send_email.smtp_pool import get_smtp_pool
+from supervisely import Api, logger
+
+
+class EmailOutbox:
+    """
+    Durable queue of outgoing emails processed by a background worker.
+
+    Every queued email is stored as a JSON file in the spool directory until it is sent
+    or runs out of attempts, so pending notifications survive app restarts. Failed sends
+    are retried with exponential backoff, and sends are throttled per SMTP host according
+    to SMTP_RATE_LIMITS. Passwords are never written to disk: messages wait in the spool
+    until the credentials for their sender are registered.
+
+    Attachments are fitted into the size budget by the worker before the first send attempt
+    (see fit_attachments), so enqueueing never waits for Team Files uploads.
+    """
+
+    class Status:
+        PENDING = "pending"
+        SENT = "sent"
+        FAILED = "failed"
+
+    def __init__(
+        self,
+        spool_dir: Optional[str] = None,
+        max_attempts: int = 5,
+        base_delay: float = 10,
+        max_delay: float = 600,
+    ):
+        self.spool_dir = spool_dir or get_data_path("outbox")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._messages: Dict[str, Dict[str, Any]] = {}
+        self._credentials: Dict[Tuple[str, int, str], SendEmail.EmailCredentials] = {}
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._api: Optional[Api] = None  # uploads the attachments that do not fit
+        self._fitted: Dict[str, Tuple[List[str], str]] = {}  # batch ID -> attachments, note
+        self._next_send_at: Dict[str, float] = {}
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._worker: Optional[threading.Thread] = None
+        self._load()
+
+    @property
+    def pending_messages(self) -> List[Dict[str, Any]]:
+        """
+        Returns the messages that are waiting to be sent or retried.
+        """
+        with self._condition:
+            return list(self._messages.values())
+
+    def register_credentials(self, credentials: SendEmail.EmailCredentials) -> None:
+        """
+        Makes the credentials available to the worker. Messages of this sender become sendable.
+        """
+        with self._condition:
+            self._credentials[self._get_key(credentials)] = credentials
+            self._condition.notify()
+
+    def add_listener(self, fn: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Registers a callback called with the message dict whenever its status changes.
+        A SENT message may have `refused` recipients (address -> SMTP reply) that did not get it.
+        """
+        self._listeners.append(fn)
+
+    def enqueue(
+        self,
+        credentials: SendEmail.EmailCredentials,
+        to_addrs: List[str],
+        subject: str,
+        body: str,
+        attachments: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        api: Optional[Api] = None,
+        team_id: Optional[int] = None,
+    ) -> str:
+        """
+        Stores the email in the spool and returns its ID immediately.
+        `metadata` is kept with the message and passed back to the listeners.
+        Attachments over the size budget are replaced with Team Files links (see fit_attachments).
+        """
+        message = {"to_addrs": to_addrs, "subject": subject, "body": body, "metadata": metadata}
+        return self.enqueue_batch(credentials, [message], attachments, api, team_id)[0]
+
+    def enqueue_batch(
+        self,
+        credentials: SendEmail.EmailCredentials,
+        messages: List[Dict[str, Any]],
+        attachments: Optional[List[str]] = None,
+        api: Optional[Api] = None,
+        team_id: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Stores many emails (dicts with to_addrs, subject, body and optional metadata) at once,
+        e.g. one per recipient, and returns their IDs. The attachments are shared by all
+        emails and checked against the size budget only once, by the worker.
+        """
+        if api is not None:
+            self._api = api
+        now = time.time()
+        batch_id = uuid4().hex
+        batch = [
+            {
+                "id": uuid4().hex,
+                "batch_id": batch_id,
+                "sender": self._get_key(credentials),
+                "to_addrs": list(msg["to_addrs"]),
+                "subject": msg["subject"],
+                "body": msg["body"],
+                "attachments": list(attachments or []),
+                "attachments_fitted": not attachments,
+                "team_id": team_id,
+                "metadata": msg.get("metadata") or {},
+                "status": self.Status.PENDING,
+                "attempts": 0,
+                "next_attempt_at": now,
+                "error": None,
+            }
+            for msg in messages
+        ]
+        self.register_credentials(credentials)
+        with self._condition:
+            for message in batch:
+                self._messages[message["id"]] = message
+                self._save(message)
+            self._condition.notify()
+        self.start()
+        return [message["id"] for message in batch]
+
+    def start(self) -> None:
+        """
+        Starts the background worker if it is not running.
+        """
+        with self._condition:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._stopped = False
+            self._worker = threading.Thread(target=self._run, name="email_outbox", daemon=True)
+            self._worker.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                message, wait = self._next_due()
+                if message is None:
+                    self._condition.wait(wait)
+                    continue
+            self._process(message)
+
+    def _next_due(self) -> Tuple[Optional[Dict[str, Any]], Optional[float]]:
+        """
+        Returns the next message that can be sent now, or the time to wait for one.
+        """
+        now = time.time()
+        wait = None
+        for message in sorted(self._messages.values(), key=lambda m: m["next_attempt_at"]):
+            if tuple(message["sender"]) not in self._credentials:
+                continue
+            host = message["sender"][0]
+            due_at = max(message["next_attempt_at"], self._next_send_at.get(host, 0))
+            if due_at <= now:
+                rate = SMTP_RATE_LIMITS.get(host, DEFAULT_SMTP_RATE_LIMIT)
+                self._next_send_at[host] = now + 1 / rate
+                return message, None
+            wait = due_at - now if wait is None else min(wait, due_at - now)
+        return None, wait
+
+    def _fit_attachments(self, message: Dict[str, Any]) -> None:
+        """
+        Replaces the attachments over the size budget with Team Files links in the body.
+        Done once per batch: the other emails of the batch reuse the result.
+        """
+        batch_id = message.get("batch_id")
+        if batch_id not in self._fitted:
+            self._fitted[batch_id] = fit_attachments(
+                message["attachments"], "", api=self._api, team_id=message.get("team_id")
+            )
+        attachments, note = self._fitted[batch_id]
+        message["attachments"] = attachments
+        message["body"] += note
+        message["attachments_fitted"] = True
+        with self._condition:
+            self._save(message)
+
+    def _process(self, message: Dict[str, Any]) -> None:
+        credentials = self._credentials[tuple(message["sender"])]
+        try:
+            if not message.get("attachments_fitted", True):
+                self._fit_attachments(message)
+            for path in message["attachments"]:
+                if not os.path.isfile(path):
+                    raise FileNotFoundError(f"Attachment not found: {path}")
+            refused = get_smtp_pool().send_stream(
+                credentials,
+                credentials.username,
+                message["to_addrs"],
+                lambda: iter_message_chunks(
+                    credentials.username,
+                    message["to_addrs"],
+                    message["subject"],
+                    message["body"],
+                    message["attachments"],
+                ),
+            )
+        except Exception as e:
+            message["attempts"] += 1
+            message["error"] = str(e)
+            if message["attempts"] >= self.max_attempts or self._is_permanent(e):
+                logger.error(
+                    f"Failed to send email {message['id']} after {message['attempts']} attempts.",
+                    exc_info=True,
+                )
+                self._finish(message, self.Status.FAILED)
+                return
+            delay = min(self.base_delay * 2 ** (message["attempts"] - 1), self.max_delay)
+            message["next_attempt_at"] = time.time() + delay
+            logger.warning(f"Failed to send email {message['id']}, retrying in {delay:.0f}s: {e}")
+            with self._condition:
+                self._save(message)
+            return
+        message["refused"] = {addr: f"{code} {resp!r}" for addr, (code, resp) in refused.items()}
+        if refused:
+            logger.warning(f"Email {message['id']} was refused for {list(refused)}.")
+        logger.info(f"Email sent to {[a for a in message['to_addrs'] if a not in refused]}")
+        self._finish(message, self.Status.SENT)
+
+    def _finish(self, message: Dict[str, Any], status: str) -> None:
+        message["status"] = status
+        with self._condition:
+            self._messages.pop(message["id"], None)
+            self._remove(message)
+            batch_id = message.get("batch_id")
+            if all(m.get("batch_id") != batch_id for m in self._messages.values()):
+                self._fitted.pop(batch_id, None)
+        for fn in self._listeners:
+            try:
+                fn(message)
+            except Exception:
+                logger.error("Email outbox listener failed.", exc_info=True)
+
+    @staticmethod
+    def _is_permanent(error: Exception) -> bool:
+        """
+        Returns True for errors that retrying cannot fix, e.g. a rejected recipient address
+        or a missing attachment.
+        """
+        if isinstance(error, FileNotFoundError):
+            return True
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            return all(code >= 500 for code, _ in error.recipients.values())
+        return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
+
+    @staticmethod
+    def _get_key(credentials: SendEmail.EmailCredentials) -> Tuple[str, int, str]:
+        return (credentials.host, credentials.port, credentials.username)
+
+    def _get_path(self, message: Dict[str, Any]) -> str:
+        return os.path.join(self.spool_dir, f"{message['id']}.json")
+
+    def _save(self, message: Dict[str, Any]) -> None:
+        write_json(self._get_path(message), message)
+
+    def _remove(self, message: Dict[str, Any]) -> None:
+        path = self._get_path(message)
+        if os.path.isfile(path):
+            os.remove(path)
+
+    def _load(self) -> None:
+        if not os.path.isdir(self.spool_dir):
+            return
+        for filename in os.listdir(self.spool_dir):
+            if not filename.endswith(".json"):
+                continue
+            message = read_json(os.path.join(self.spool_dir, filename))
+            if message is not None:
+                self._messages[message["id"]] = message
+        if self._messages:
+            logger.info(f"Restored {len(self._messages)} pending emails from the outbox.")
+
+
+_email_outbox = None
+_email_outbox_lock = threading.Lock()
+
+
+def get_email_outbox() -> EmailOutbox:
+    """
+    Returns the outbox shared by all email notification nodes.
+    """
+    global _email_outbox
+    with _email_outbox_lock:
+        if _email_outbox is None:
+            _email_outbox = EmailOutbox()
+        return _email_outbox
@@ -1,9 +1,11 @@
-import mimetypes
-import os
-import smtplib
-from typing import Optional
+import re
+from string import Template
+from typing import Any, Dict, List, Optional, Tuple
 
-from supervisely.app.widgets import Button, Container, Field, Input, TextArea, Widget
+from src.components.send_email.mime_stream import fit_attachments, iter_message_chunks
+from src.components.send_email.smtp_pool import get_smtp_pool
+from supervisely import Api
+from supervisely.app.widgets import Button, Container, Field, Input, Switch, TextArea, Widget
 
 SMTP_PROVIDERS = {
     "gmail.com": ("smtp.gmail.com", 587),
@@ -14,6 +16,17 @@ SMTP_PROVIDERS = {
     "icloud.com": ("smtp.mail.me.com", 587),
 }
 
+# Max emails per second for each SMTP host, to stay below the providers' rate limits
+SMTP_RATE_LIMITS = {
+    "smtp.gmail.com": 1.0,
+    "smtp.office365.com": 0.5,
+    "smtp.mail.yahoo.com": 0.5,
+    "smtp.mail.me.com": 0.5,
+}
+DEFAULT_SMTP_RATE_LIMIT = 1.0
+
+EMAIL_RE = re.compile(r"^[^@\s,;<>]+@[^@\s,;<>]+\.[^@\s,;<>]+$")
+
 
 class SendEmail(Widget):
     class EmailCredentials:
@@ -87,25 +100,71 @@ class SendEmail(Widget):
             "Configure the body of the email notification.",
         )
 
+        self._individual_switch = Switch(False)
+        individual_field = Field(
+            self._individual_switch,
+            "Send individually",
+            "Send a separate email to each recipient. Subject and body can use "
+            "$email, $name and $domain placeholders.",
+        )
+
         self._apply_button = Button("Apply")
         return Container(
             [
                 target_addresses_field,
                 subject_input_field,
                 body_input_field,
+                individual_field,
                 self._apply_button,
             ]
         )
 
+    @staticmethod
+    def parse_addresses(value: str) -> Tuple[List[str], List[str]]:
+        """
+        Splits the addresses by commas, semicolons or whitespace, strips and deduplicates them
+        (case-insensitive). Returns the valid and the invalid addresses.
+        """
+        valid, invalid, seen = [], [], set()
+        for addr in re.split(r"[,;\s]+", value or ""):
+            if not addr or addr.lower() in seen:
+                continue
+            seen.add(addr.lower())
+            (valid if EMAIL_RE.match(addr) else invalid).append(addr)
+        return valid, invalid
+
+    @staticmethod
+    def render_template(
+        template: str, recipient: str, context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Substitutes $email, $name, $domain and the `context` keys in the template.
+        Unknown placeholders are left as is.
+        """
+        name, _, domain = recipient.partition("@")
+        values = {"email": recipient, "name": name, "domain": domain, **(context or {})}
+        return Template(template).safe_substitute(values)
+
     def get_target_addresses(self):
         """
         Returns a list of email addresses to send the notification to.
         If no addresses are provided, returns None.
         """
-        value = self._target_addresses_input.get_value()
-        if not value:
-            return None
-        return self._target_addresses_input.get_value().split(",")
+        valid, _ = self.parse_addresses(self._target_addresses_input.get_value())
+        return valid or None
+
+    def get_invalid_addresses(self) -> List[str]:
+        """
+        Returns the entered addresses that are not valid email addresses.
+        """
+        _, invalid = self.parse_addresses(self._target_addresses_input.get_value())
+        return invalid
+
+    def is_individual(self) -> bool:
+        """
+        Returns whether a separate email is sent to each recipient.
+        """
+        return self._individual_switch.is_switched()
 
     def get_subject(self):
         """
@@ -127,45 +186,81 @@ class SendEmail(Widget):
     def get_json_state(self):
         return {}
 
-    def send_email(self, credentials: EmailCredentials, attachments: Optional[list] = None):
+    def get_message_fields(self, credentials: EmailCredentials) -> dict:
+        """
+        Returns the recipients, subject and body configured in the widget.
+        Falls back to the defaults and to the sender address if fields are empty.
+        """
+        return {
+            "to_addrs": self.get_target_addresses() or [credentials.username],
+            "subject": self.get_subject() or self._default_subject or "",
+            "body": self.get_body() or self._default_body or "",
+        }
+
+    def get_recipient_messages(
+        self, credentials: EmailCredentials, context: Optional[Dict[str, Any]] = None
+    ) -> List[dict]:
+        """
+        Returns one message per recipient with the subject and body rendered for that recipient.
+        """
+        fields = self.get_message_fields(credentials)
+        return [
+            {
+                "to_addrs": [addr],
+                "subject": self.render_template(fields["subject"], addr, context),
+                "body": self.render_template(fields["body"], addr, context),
+            }
+            for addr in fields["to_addrs"]
+        ]
+
+    def send_email(
+        self,
+        credentials: EmailCredentials,
+        attachments: Optional[list] = None,
+        api: Optional[Api] = None,
+        team_id: Optional[int] = None,
+    ):
         """
         Send an email via SMTP. If smtp_host/port are not provided,
         they will be inferred from the username's email domain using SMTP_PROVIDERS.
-        """
+        The SMTP session is taken from the shared pool and kept open for the next emails.
+        In individual mode every recipient gets a separate message over the same session.
 
-        from email.message import EmailMessage
+        Attachments are streamed from disk. Files over the MAX_ATTACHMENTS_SIZE budget are
+        uploaded to Team Files (if `api` and `team_id` are given) and linked in the body.
 
+        Returns the delivery error of every recipient (None if delivered).
+        """
         from supervisely import logger
 
-        msg = EmailMessage()
-        msg["Subject"] = self.get_subject() or self._default_subject
-        msg["From"] = credentials.username
-        msg["To"] = self.get_target_addresses() or [credentials.username]
-
-        body = self.get_body() or self._default_body
-        msg.set_content(body)
-
-        for path in attachments or []:
-            if not os.path.isfile(path):
-                raise FileNotFoundError(f"Attachment not found: {path}")
-            ctype, encoding = mimetypes.guess_type(path)
-            maintype, subtype = (ctype or "application/octet-stream").split("/", 1)
-            with open(path, "rb") as fp:
-                msg.add_attachment(
-                    fp.read(), maintype=maintype, subtype=subtype, filename=os.path.basename(path)
-                )
-
-        with smtplib.SMTP(self.creds.host, self.creds.port) as server:
-            server.ehlo()
-            server.starttls()
-            server.ehlo()
-            try:
-                server.login(self.creds.username, self.creds.password)
-            except smtplib.SMTPAuthenticationError as e:
-                logger.error("Failed to auxthenticate with the provided email credentials.")
-                raise e
-            except (smtplib.SMTPException, smtplib.SMTPServerDisconnected) as e:
-                logger.error(f"Failed to login to SMTP: {e}", exc_info=False)
-                raise e
-            server.send_message(msg)
-            logger.info(f"Email sent to {self.to_addrs}")
+        if self.is_individual():
+            messages = self.get_recipient_messages(credentials)
+        else:
+            messages = [self.get_message_fields(credentials)]
+        attachments, note = fit_attachments(attachments or [], "", api=api, team_id=team_id)
+        batch = [
+            (
+                msg["to_addrs"],
+                lambda msg=msg: iter_message_chunks(
+                    credentials.username,
+                    msg["to_addrs"],
+                    msg["subject"],
+                    msg["body"] + note,
+                    attachments,
+                ),
+            )
+            for msg in messages
+        ]
+        results = {}
+        errors = get_smtp_pool().send_batch(credentials, credentials.username, batch)
+        for (to_addrs, _), error in zip(batch, errors):
+            for addr in to_addrs:
+                if isinstance(error, dict):  # refused recipients of a delivered message
+                    results[addr] = str(error[addr]) if addr in error else None
+                else:
+                    results[addr] = str(error) if error is not None else None
+        sent = [addr for addr, error in results.items() if error is None]
+        logger.info(f"Email sent to {sent}")
+        if len(sent) < len(results):
+            logger.warning(f"Failed to send email to {len(results) - len(sent)} recipients.")
+        return results
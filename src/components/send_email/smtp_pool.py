@@ -0,0 +1,228 @@
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+from supervisely import logger
+
+
+class SMTPConnectionPool:
+    """
+    Pool of authenticated SMTP sessions keyed by (host, port, username).
+
+    Sessions are kept open between sends, checked with NOOP when they have been idle
+    for a while, and transparently re-established if the server has dropped them,
+    so a burst of emails costs a single EHLO/STARTTLS/LOGIN handshake.
+    """
+
+    def __init__(self, max_idle: int = 300, keepalive_interval: int = 30, timeout: int = 30):
+        self.max_idle = max_idle
+        self.keepalive_interval = keepalive_interval
+        self.timeout = timeout
+        self._idle: Dict[Tuple[str, int, str], List[Tuple[smtplib.SMTP, float]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(credentials) -> Tuple[str, int, str]:
+        return (credentials.host, credentials.port, credentials.username)
+
+    @contextmanager
+    def connection(self, credentials) -> Iterator[smtplib.SMTP]:
+        """
+        Context manager that lends an authenticated session and returns it to the pool.
+        The session is closed instead if the server disconnects while it is in use.
+        """
+        server = self._acquire(credentials)
+        try:
+            yield server
+        except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+            self._release(credentials, server)
+            raise
+        except (smtplib.SMTPServerDisconnected, OSError):
+            self._close(server)
+            raise
+        except Exception:
+            self._release(credentials, server)
+            raise
+        else:
+            self._release(credentials, server)
+
+    def send_stream(
+        self,
+        credentials,
+        from_addr: str,
+        to_addrs: List[str],
+        get_chunks: Callable[[], Iterable[bytes]],
+    ) -> dict:
+        """
+        Sends a message produced chunk by chunk by `get_chunks()` without building it in memory.
+        The chunks must be in SMTP wire format (CRLF line endings, dot-stuffed).
+        Reconnects once if the session has dropped. Returns the refused recipients.
+        """
+        for attempt in range(2):
+            try:
+                with self.connection(credentials) as server:
+                    return self._send_data(server, from_addr, to_addrs, get_chunks())
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                if attempt > 0:
+                    raise
+                logger.info("SMTP session was dropped by the server, reconnecting.")
+
+    def send_batch(
+        self,
+        credentials,
+        from_addr: str,
+        messages: List[Tuple[List[str], Callable[[], Iterable[bytes]]]],
+    ) -> List[Union[dict, Exception]]:
+        """
+        Sends many (to_addrs, get_chunks) messages one after another over a single session.
+        A failed message does not stop the batch; the session is re-established if it drops.
+        Returns, for each message, the dict of refused recipients or the exception raised.
+        """
+        results = []
+        server = None
+        try:
+            for to_addrs, get_chunks in messages:
+                for attempt in range(2):
+                    if server is None:
+                        try:
+                            server = self._acquire(credentials)
+                        except (smtplib.SMTPException, OSError) as e:
+                            results.append(e)
+                            break
+                    try:
+                        results.append(self._send_data(server, from_addr, to_addrs, get_chunks()))
+                    except (
+                        smtplib.SMTPResponseException,
+                        smtplib.SMTPRecipientsRefused,
+                        FileNotFoundError,
+                    ) as e:
+                        # rejected by the server or a missing attachment: retrying won't help
+                        results.append(e)
+                        if server.sock is None:
+                            server = None
+                    except OSError as e:  # includes SMTPServerDisconnected
+                        self._close(server)
+                        server = None
+                        if attempt == 0:
+                            logger.info("SMTP session was dropped by the server, reconnecting.")
+                            continue
+                        results.append(e)
+                    break
+        finally:
+            if server is not None:
+                self._release(credentials, server)
+        return results
+
+    def close_all(self) -> None:
+        """
+        Closes all idle sessions.
+        """
+        with self._lock:
+            sessions = [server for idle in self._idle.values() for server, _ in idle]
+            self._idle.clear()
+        for server in sessions:
+            self._close(server)
+
+    def _acquire(self, credentials) -> smtplib.SMTP:
+        key = self.get_key(credentials)
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                if not idle:
+                    break
+                server, last_used = idle.pop()
+            idle_time = time.monotonic() - last_used
+            if idle_time <= self.max_idle and (
+                idle_time < self.keepalive_interval or self._is_alive(server)
+            ):
+                return server
+            self._close(server)
+        return self._connect(credentials)
+
+    def _release(self, credentials, server: smtplib.SMTP) -> None:
+        if server.sock is None:
+            return  # closed after a failure in the middle of a transaction
+        with self._lock:
+            self._idle.setdefault(self.get_key(credentials), []).append((server, time.monotonic()))
+
+    def _connect(self, credentials) -> smtplib.SMTP:
+        server = smtplib.SMTP(credentials.host, credentials.port, timeout=self.timeout)
+        try:
+            server.ehlo()
+            server.starttls()
+            server.ehlo()
+            server.login(credentials.username, credentials.password)
+        except smtplib.SMTPAuthenticationError:
+            logger.error("Failed to authenticate with the provided email credentials.")
+            self._close(server)
+            raise
+        except (smtplib.SMTPException, OSError) as e:
+            logger.error(f"Failed to login to SMTP: {e}", exc_info=False)
+            self._close(server)
+            raise
+        logger.debug(f"Opened SMTP session to {credentials.host}:{credentials.port}.")
+        return server
+
+    @staticmethod
+    def _send_data(
+        server: smtplib.SMTP, from_addr: str, to_addrs: List[str], chunks: Iterable[bytes]
+    ) -> dict:
+        code, resp = server.mail(from_addr)
+        if code != 250:
+            server.rset()
+            raise smtplib.SMTPSenderRefused(code, resp, from_addr)
+        refused = {}
+        for addr in to_addrs:
+            code, resp = server.rcpt(addr)
+            if code not in (250, 251):
+                refused[addr] = (code, resp)
+        if len(refused) == len(to_addrs):
+            server.rset()
+            raise smtplib.SMTPRecipientsRefused(refused)
+        code, resp = server.docmd("DATA")
+        if code != 354:
+            server.rset()
+            raise smtplib.SMTPDataError(code, resp)
+        try:
+            for chunk in chunks:
+                server.send(chunk)
+            server.send(b".\r\n")
+        except Exception:
+            # the session is in the middle of DATA and cannot be reused
+            server.close()
+            raise
+        code, resp = server.getreply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, resp)
+        return refused
+
+    @staticmethod
+    def _is_alive(server: smtplib.SMTP) -> bool:
+        try:
+            return server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @staticmethod
+    def _close(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+
+_smtp_pool = None
+_smtp_pool_lock = threading.Lock()
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    """
+    Returns the SMTP connection pool shared by all email senders.
+    """
+    global _smtp_pool
+    with _smtp_pool_lock:
+        if _smtp_pool is None:
+            _smtp_pool = SMTPConnectionPool()
+        return _smtp_pool
@@ -1,10 +1,15 @@
 import datetime
 from typing import Any, Dict, List, Literal, Optional, Union
+from uuid import uuid4
 
 from apscheduler.triggers.cron import CronTrigger
 
 import supervisely as sly
+from src.components.persistent_history import PersistentHistory
+from src.components.send_email.digest import DigestBuffer
+from src.components.send_email.outbox import get_email_outbox
 from src.components.send_email.send_email import SendEmail
+from src.components.state_flush import get_state_flusher
 from supervisely.app.content import DataJson
 from supervisely.app.widgets import (
     Button,
@@ -12,18 +17,20 @@ from supervisely.app.widgets import (
     Container,
     Field,
     Icons,
+    InputNumber,
     SolutionCard,
     Switch,
     TimePicker,
 )
 from supervisely.app.widgets.dialog.dialog import Dialog
-from supervisely.app.widgets.tasks_history.tasks_history import TasksHistory
 from supervisely.solution.base_node import SolutionCardNode, SolutionElement
 from supervisely.solution.scheduler import TasksScheduler
 
 
 class SendEmailNode(SolutionElement):
     JOB_ID = "send_email_daily"
+    DIGEST_JOB_ID = "send_email_digest"
+    DIGEST_CHECK_INTERVAL = 60  # seconds
 
     def __init__(
         self,
@@ -46,25 +53,26 @@ class SendEmailNode(SolutionElement):
         super().__init__(*args, **kwargs)
 
         self.credentials = credentials
+        # identifies the messages of this node in the outbox spool across restarts,
+        # unlike the generated widget ID
+        self.node_key = f"send_email_{credentials.username}"
         self.task_scheduler = TasksScheduler()
-
-        self._debug_add_dummy_notification()  # For debugging purposes, delete in production
+        self.outbox = get_email_outbox()
+        self.outbox.register_credentials(credentials)
+        self.outbox.add_listener(self._on_outbox_status)
+        self.outbox.start()
+        self.digest = DigestBuffer(
+            self.node_key,
+            on_flush=lambda events: self.send_notification("Digest", events),
+            window=self.digest_window,
+            max_items=self.digest_max_items,
+        )
 
         self.card = self._create_card()
         self._update_properties()
         self.node = SolutionCardNode(content=self.card, x=x, y=y)
         self.modals = [self.settings_modal, self.automation_modal, self.history_modal]
 
-    def _debug_add_dummy_notification(self):
-        """
-        Adds a dummy notification to the history for debugging purposes.
-        """
-        dummy_notification = Notification(
-            ["someuser123@example.com", "dummy228@yahoo.com"], "Debug"
-        )
-        self.notification_history.add_notification(dummy_notification.to_json())
-        self.notification_history.update_notification_status(0, Notification.Status.SENT)
-
     @property
     def settings_modal(self) -> Dialog:
         """
@@ -93,7 +101,7 @@ class SendEmailNode(SolutionElement):
         return self._history_modal
 
     @property
-    def notification_history(self) -> NotificationHistory:
+    def notification_history(self) -> "NotificationHistory":
         """
         Returns the notification history instance.
         """
@@ -104,7 +112,7 @@ class SendEmailNode(SolutionElement):
     def _init_history_modal(self) -> Dialog:
         history_modal = Dialog(
             title="Notification History",
-            content=self.notification_history,
+            content=self.notification_history.content,
             size="large",
         )
         return history_modal
@@ -118,34 +126,115 @@ class SendEmailNode(SolutionElement):
             self.save()
             settings_modal.hide()
 
-        def send_email_fn():
+        self.email_widget = send_email
+        self.run_fn = self._send_daily
+        self._get_email_widget_values = lambda: {
+            "subject": send_email.get_subject(),
+            "body": send_email.get_body(),
+            "target_addresses": send_email.get_target_addresses(),
+            "individual": send_email.is_individual(),
+        }
+        return settings_modal
+
+    def send_notification(self, origin: str, events: Optional[List[Dict[str, Any]]] = None) -> None:
+        """
+        Queues the notification in the outbox and returns immediately.
+        Its status in the history is updated when the outbox sends it.
+        `events` are appended to the body as a digest.
+        """
+        with get_state_flusher().transaction():
             self.hide_failed_badge()
-            self.hide_running_badge()
             self.show_running_badge()
-            notification_origin = "Daily" if self.use_daily else "Comparison"
-            notification = Notification(self.target_addresses, notification_origin).to_json()
-            n_idx = self.notification_history.add_notification(notification)
-            try:
-                send_email.send_email(self.credentials)
-                self.show_finished_badge()
-                self.hide_running_badge()
-                self.notification_history.update_notification_status(
-                    n_idx, Notification.Status.SENT
+            send_email = self.email_widget
+            for addr in send_email.get_invalid_addresses():
+                sly.logger.warning(f"Skipping invalid email address: {addr}")
+                notification = Notification(addr, origin, Notification.Status.FAILED)
+                self.notification_history.add_notification(notification)
+            if send_email.is_individual():
+                messages = send_email.get_recipient_messages(self.credentials, {"origin": origin})
+            else:
+                messages = [send_email.get_message_fields(self.credentials)]
+            for message in messages:
+                if events:
+                    message["subject"] += f" ({len(events)} updates)" if len(events) > 1 else ""
+                    message["body"] += "\n\n" + DigestBuffer.format_events(events)
+                notification = Notification(message["to_addrs"], origin)
+                notification_id = self.notification_history.add_notification(notification)
+                message["metadata"] = {
+                    "node": self.node_key,
+                    "notification_id": notification_id,
+                    "origin": origin,
+                }
+        self.outbox.enqueue_batch(self.credentials, messages)
+
+    def notify_comparison(
+        self, result_dir: str, result_link: str, best_checkpoint: Optional[str] = None
+    ) -> None:
+        """
+        Sends a notification about a finished comparison if "After Comparison" is enabled.
+        In digest mode the event is buffered and sent later with the other events.
+        """
+        if not self.run_after_comparison:
+            return
+        event = {
+            "type": "comparison",
+            "message": f"Comparison finished: {result_dir}",
+            "link": result_link,
+            "best_checkpoint": best_checkpoint,
+        }
+        if self.use_digest:
+            self.digest.add(event)
+        else:
+            self.send_notification("Comparison", [event])
+
+    def _send_daily(self) -> None:
+        """
+        Sends the daily notification. In digest mode it also carries the buffered events.
+        """
+        if self.use_digest and len(self.digest) > 0:
+            self.digest.flush(lambda events: self.send_notification("Daily", events))
+        else:
+            self.send_notification("Daily")
+
+    def _on_outbox_status(self, message: Dict[str, Any]) -> None:
+        """
+        Moves the notification of the outbox message to SENT or FAILED.
+        Recipients refused by the server get their own FAILED rows.
+        """
+        metadata = message.get("metadata", {})
+        if metadata.get("node") != self.node_key:
+            return
+        with get_state_flusher().transaction():
+            refused = message.get("refused") or {}
+            for addr in refused:
+                notification = Notification(
+                    addr, metadata.get("origin"), Notification.Status.FAILED
                 )
-            except:
+                self.notification_history.add_notification(notification)
+            if message["status"] == self.outbox.Status.SENT and not refused:
+                status = Notification.Status.SENT
+                self.show_finished_badge()
+            elif message["status"] == self.outbox.Status.SENT:
+                status = Notification.Status.SENT  # delivered to the other recipients
                 self.show_failed_badge()
-                self.hide_running_badge()
+            else:
+                status = Notification.Status.FAILED
+                self.show_failed_badge()
+            try:
                 self.notification_history.update_notification_status(
-                    n_idx, Notification.Status.FAILED
+                    metadata.get("notification_id"), status
                 )
+            except KeyError:
+                sly.logger.warning("Notification of the sent email is not in the history anymore.")
+            if not self._has_pending_emails():
+                self.hide_running_badge()
+            self._update_properties()
 
-        self.run_fn = send_email_fn
-        self._get_email_widget_values = lambda: {
-            "subject": send_email.get_subject(),
-            "body": send_email.get_body(),
-            "target_addresses": send_email.get_target_addresses(),
-        }
-        return settings_modal
+    def _has_pending_emails(self) -> bool:
+        return any(
+            message.get("metadata", {}).get("node") == self.node_key
+            for message in self.outbox.pending_messages
+        )
 
     def _init_automation_modal(self):
         use_daily_switch = Switch(False)
@@ -153,6 +242,9 @@ class SendEmailNode(SolutionElement):
         after_comparison = CheckboxField(
             "After Comparison", "Enable to send an email after each comparison.", False
         )
+        use_digest_switch = Switch(self.use_digest)
+        digest_window_input = InputNumber(self.digest_window // 60, min=1, max=24 * 60, step=5)
+        digest_max_items_input = InputNumber(self.digest_max_items, min=1, max=1000)
         apply_button = Button("Apply")
         automation_modal = Dialog(
             title="Automation Settings",
@@ -169,6 +261,21 @@ class SendEmailNode(SolutionElement):
                         "Specify the time of day to send daily notifications.",
                     ),
                     after_comparison,
+                    Field(
+                        use_digest_switch,
+                        "Digest",
+                        "Collect notifications and send them together as one email.",
+                    ),
+                    Field(
+                        digest_window_input,
+                        "Digest window (minutes)",
+                        "Send the digest once its oldest notification has waited this long.",
+                    ),
+                    Field(
+                        digest_max_items_input,
+                        "Max notifications per digest",
+                        "Send the digest earlier if it collects this many notifications.",
+                    ),
                     apply_button,
                 ]
             ),
@@ -179,13 +286,17 @@ class SendEmailNode(SolutionElement):
             "use_daily": use_daily_switch.is_switched(),
             "daily_time": daily_time_picker.get_value(),
             "run_after_comparison": after_comparison.is_checked(),
+            "use_digest": use_digest_switch.is_switched(),
+            "digest_window": digest_window_input.get_value() * 60,
+            "digest_max_items": digest_max_items_input.get_value(),
         }
 
         @apply_button.click
         def apply_automation_settings():
-            self.save()
-            self._update_properties()
-            self.update_scheduler()
+            with get_state_flusher().transaction():
+                self.save()
+                self._update_properties()
+                self.update_scheduler()
             automation_modal.hide()
 
         return automation_modal
@@ -270,6 +381,27 @@ class SendEmailNode(SolutionElement):
             .get("run_after_comparison", False)
         )
 
+    @property
+    def use_digest(self) -> bool:
+        """
+        Returns whether notifications are collected and sent as a digest.
+        """
+        return DataJson()[self.widget_id].get("automation_settings", {}).get("use_digest", False)
+
+    @property
+    def digest_window(self) -> int:
+        """
+        Returns the digest window in seconds.
+        """
+        return DataJson()[self.widget_id].get("automation_settings", {}).get("digest_window", 3600)
+
+    @property
+    def digest_max_items(self) -> int:
+        """
+        Returns the number of notifications that triggers sending the digest early.
+        """
+        return DataJson()[self.widget_id].get("automation_settings", {}).get("digest_max_items", 20)
+
     def save(self) -> None:
         """
         Saves the current state of the SendEmailNode.
@@ -302,9 +434,7 @@ class SendEmailNode(SolutionElement):
             },
             {
                 "key": "Total",
-                "value": "{} notifications".format(
-                    len(self.notification_history.get_notifications())
-                ),
+                "value": "{} notifications".format(self.notification_history.count),
                 "link": False,
                 "highlight": False,
             },
@@ -315,10 +445,12 @@ class SendEmailNode(SolutionElement):
                 "highlight": False,
             },
         ]
-        for prop in new_propetries:
-            self.card.update_property(**prop)
+        with get_state_flusher().transaction():
+            for prop in new_propetries:
+                self.card.update_property(**prop)
 
     def update_scheduler(self):
+        self._update_digest_scheduler()
         use_daily = self.use_daily
         if not use_daily:
             if self.task_scheduler.is_job_scheduled(self.JOB_ID):
@@ -340,6 +472,26 @@ class SendEmailNode(SolutionElement):
             f"[SCHEDULER]: Job '{job.id}' scheduled to send emails at {time} every day."
         )
 
+    def _update_digest_scheduler(self):
+        self.digest.window = self.digest_window
+        self.digest.max_items = self.digest_max_items
+        if not self.use_digest:
+            if self.task_scheduler.is_job_scheduled(self.DIGEST_JOB_ID):
+                self.task_scheduler.remove_job(self.DIGEST_JOB_ID)
+                sly.logger.info("[SCHEDULER]: Email digest job is disabled.")
+            self.digest.flush()  # send what was collected before digest mode was turned off
+            return
+        self.task_scheduler.add_job(
+            self.digest.check,
+            interval=min(self.DIGEST_CHECK_INTERVAL, self.digest_window),
+            job_id=self.DIGEST_JOB_ID,
+            replace_existing=True,
+        )
+        sly.logger.info(
+            f"[SCHEDULER]: Email digest is sent every {self.digest_window} seconds "
+            f"or after {self.digest_max_items} notifications."
+        )
+
     def _create_card(self) -> SolutionCard:
         """
         Creates and returns the SolutionCard for the SendEmailNode.
@@ -450,10 +602,13 @@ class Notification:
         origin: str,
         status: str = None,
         created_at: str = None,
+        id: str = None,
     ):
         """
         Initialize a notification with the recipient, origin, status, and creation time.
+        The ID is a unique key of the notification in the history.
         """
+        self.id = id or uuid4().hex
         self.sent_to = sent_to
         self.origin = origin
         self.status = status or self.Status.PENDING
@@ -464,6 +619,7 @@ class Notification:
         Convert the notification history to a JSON serializable format.
         """
         return {
+            "id": self.id,
             "created_at": self.created_at,
             "sent_to": ", ".join(self.sent_to) if isinstance(self.sent_to, list) else self.sent_to,
             "origin": self.origin,
@@ -471,68 +627,49 @@ class Notification:
         }
 
 
-class NotificationHistory(TasksHistory):
+class NotificationHistory(PersistentHistory):
     def __init__(
         self,
+        name: str = "notification_history",
         widget_id: str = None,
     ):
-        super().__init__(widget_id=widget_id)
-        self._remove_unused_args()
-        self._table_columns = [
-            "Created At",
-            "Sent To",
-            "Origin",
-            "Status",
-        ]
-        self._columns_keys = [
-            ["created_at"],
-            ["sent_to"],
-            ["origin"],
-            ["status"],
-        ]
+        super().__init__(
+            name,
+            columns=[
+                "Created At",
+                "Sent To",
+                "Origin",
+                "Status",
+            ],
+            columns_keys=[
+                ["created_at"],
+                ["sent_to"],
+                ["origin"],
+                ["status"],
+            ],
+            widget_id=widget_id,
+        )
 
-    def update(self):
-        self.table.clear()
-        for task in self.get_tasks():
-            self.table.insert_row(list(task.values()))
-
-    def add_task(self, task: Union[Notification, Dict[str, Any]]):
-        if isinstance(task, Notification):
-            task = task.to_json()
-        super().add_task(task)
-        self.update()
-
-    def update_task(self, time: datetime.datetime, task: Union[Notification, Dict[str, Any]]):
-        if isinstance(task, Notification):
-            task = task.to_json()
-        tasks = self.get_tasks()
-        for task in tasks:
-            if task["created_at"] == time:
-                task.update(task)
-                DataJson()[self.widget_id]["tasks"] = tasks
-                DataJson().send_changes()
-                return
-        raise KeyError(f"Task with created_at {time} not found in the notification history.")
+    def add_notification(self, notification: Union[Notification, Dict[str, Any]]) -> str:
+        """
+        Adds a notification to the history and returns its ID.
+        """
+        return self.add_task(notification)
+
+    def get_notifications(self) -> List[Dict[str, Any]]:
+        """
+        Returns the notifications of the current page.
+        """
+        return self.get_tasks()
+
+    def update_notification_status(self, notification_id: str, status: str) -> None:
+        """
+        Sets the status (PENDING, SENT, FAILED) of the notification by its ID.
+        """
+        self.update_task(notification_id, {"status": status})
 
     @property
     def table(self):
         if not hasattr(self, "_notification_table"):
             self._notification_table = self._create_notification_history_table()
         return self._notification_table
-
-    def _remove_unused_args(self):
-        """
-        Removes unused arguments from the class to avoid confusion.
-        """
-        unused_args = [
-            "api",
-            "_stop_autorefresh",
-            "_refresh_thread",
-            "_refresh_interval",
-            "_autorefresh",
-            "stop_autorefresh",
-            "start_autorefresh",
-        ]
-        for arg in unused_args:
-            if hasattr(self, arg):
-                delattr(self, arg)
@@ -0,0 +1,243 @@
+import hashlib
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import supervisely as sly
+from src.components.local_files import get_data_path, read_json, write_json
+
+LISTING_WORKERS = 8
+MAX_SHARDS = 8
+KEYS_PER_SHARD = 1000  # new objects of partly imported folders imported by one task
+
+
+class ImportManifest:
+    """
+    Keys of the objects already imported from a cloud prefix, plus a watermark: the latest
+    modification time of the objects of the last fully successful import.
+
+    The keys are stored as an append-only text file with one key per line, so adding the
+    keys of a finished shard never rewrites what is already there. An object is new if its
+    key is missing or it was modified after the watermark.
+    """
+
+    def __init__(self, prefix: str, path: Optional[str] = None):
+        self.prefix = prefix
+        digest = hashlib.sha1(prefix.encode("utf-8")).hexdigest()[:16]
+        self.path = path or get_data_path(os.path.join("import_manifests", f"{digest}.txt"))
+        self.watermark_path = f"{os.path.splitext(self.path)[0]}.json"
+        self._keys = set()
+        self._lock = threading.Lock()
+        if os.path.isfile(self.path):
+            with open(self.path, "r") as f:
+                self._keys = {line.rstrip("\n") for line in f if line.strip()}
+        watermark = read_json(self.watermark_path, default={})
+        self.last_modified: Optional[str] = watermark.get("last_modified")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def is_new(self, info) -> bool:
+        """
+        Returns True if the listed object was never imported or was modified since.
+        """
+        if info.path not in self._keys:
+            return True
+        updated_at = getattr(info, "updated_at", None)
+        return bool(updated_at and self.last_modified and updated_at > self.last_modified)
+
+    def advance(self, last_modified: Optional[str]) -> None:
+        """
+        Moves the watermark to the modification time, if it is later, and saves it.
+        """
+        with self._lock:
+            if last_modified is None or (self.last_modified or "") >= last_modified:
+                return
+            self.last_modified = last_modified
+            write_json(self.watermark_path, {"last_modified": last_modified})
+
+    def add_many(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            new_keys = [key for key in keys if key not in self._keys]
+            if not new_keys:
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a") as f:
+                f.writelines(f"{key}\n" for key in new_keys)
+            self._keys.update(new_keys)
+
+
+class ImportShard(NamedTuple):
+    path: str  # a folder whose objects are all new, or the common folder of `keys`
+    new_keys: List[str]
+    keys: Optional[List[str]] = None  # the objects to import, None to import the whole path
+
+    @property
+    def id(self) -> Tuple[str, Optional[Tuple[str, ...]]]:
+        return self.path, None if self.keys is None else tuple(self.keys)
+
+
+def list_objects(api: sly.Api, team_id: int, prefix: str) -> List:
+    """
+    Lists all objects under the prefix, each top-level sub-prefix in parallel. The objects
+    are listed with metadata, as the manifest watermark needs their `updated_at`.
+    """
+    entries = api.storage.list(
+        team_id, prefix, recursive=False, return_type="fileinfo", with_metadata=True
+    )
+    files = [entry for entry in entries if not entry.is_dir]
+
+    def list_sub_prefix(path: str) -> List:
+        return api.storage.list(
+            team_id,
+            path,
+            recursive=True,
+            return_type="fileinfo",
+            with_metadata=True,
+            include_folders=False,
+        )
+
+    with ThreadPoolExecutor(LISTING_WORKERS) as executor:
+        sub_prefixes = [entry.path for entry in entries if entry.is_dir]
+        for sub_files in executor.map(list_sub_prefix, sub_prefixes):
+            files.extend(sub_files)
+    return files
+
+
+def plan_shards(
+    prefix: str, files: List, manifest: ImportManifest, max_shards: int = MAX_SHARDS
+) -> List[ImportShard]:
+    """
+    Splits the new objects under the prefix (see `ImportManifest.is_new`) into at most
+    `max_shards` shards that can be imported in parallel without importing any other
+    object again.
+
+    The largest folders that contain only new objects are imported as a whole. The new
+    objects of folders that were partly imported before (and the objects directly under
+    the prefix, unless the prefix has no sub-prefixes and is new as a whole) are imported
+    by their keys, up to `KEYS_PER_SHARD` keys per shard. If there are more folders than
+    shards, the smallest ones are imported by their keys as well.
+    """
+    prefix = prefix.rstrip("/") + "/"
+    keys = [info.path for info in files]
+    mixed = set()  # folders that contain already imported objects
+    new_keys = []
+    for info in files:
+        if manifest.is_new(info):
+            new_keys.append(info.path)
+        else:
+            mixed.update(_folders(prefix, info.path))
+    has_sub_prefixes = any("/" in key[len(prefix) :] for key in keys)
+    if has_sub_prefixes:
+        mixed.add(prefix)  # importing the prefix would re-import its sub-prefixes
+
+    folders: Dict[str, List[str]] = {}
+    loose_keys = []
+    for key in new_keys:
+        folder = next((f for f in _folders(prefix, key) if f not in mixed), None)
+        if folder is None:
+            loose_keys.append(key)
+        else:
+            folders.setdefault(folder, []).append(key)
+
+    batches = math.ceil(len(loose_keys) / KEYS_PER_SHARD)
+    if len(folders) + batches > max_shards:
+        # keep the largest folders whole, import the objects of the others by their keys
+        by_size = sorted(folders.items(), key=lambda item: len(item[1]), reverse=True)
+        whole = max(max_shards - max(batches, 1), 0)
+        folders = dict(by_size[:whole])
+        for _, folder_keys in by_size[whole:]:
+            loose_keys.extend(folder_keys)
+        batches = max_shards - len(folders)
+
+    shards = [ImportShard(folder, folder_keys) for folder, folder_keys in folders.items()]
+    if loose_keys:
+        loose_keys.sort()  # keeps the keys of a folder together
+        size = math.ceil(len(loose_keys) / batches)
+        for i in range(0, len(loose_keys), size):
+            batch = loose_keys[i : i + size]
+            shards.append(ImportShard(_common_folder(prefix, batch), batch, batch))
+    sly.logger.info(
+        f"{len(new_keys)} of {len(keys)} objects under '{prefix}' are new, "
+        f"importing them as {len(shards)} shards."
+    )
+    return shards
+
+
+def _folders(prefix: str, key: str) -> List[str]:
+    """
+    Returns the folders of the key below the prefix, the prefix first.
+    """
+    parts = key[len(prefix) :].split("/")[:-1]
+    return [prefix + "".join(f"{part}/" for part in parts[:i]) for i in range(len(parts) + 1)]
+
+
+def _common_folder(prefix: str, keys: List[str]) -> str:
+    """
+    Returns the deepest folder below the prefix that contains all the keys.
+    """
+    common = os.path.commonprefix([key[len(prefix) :] for key in keys])
+    return prefix + common[: common.rfind("/") + 1]
+
+
+class ShardedImport:
+    """
+    A group of shard imports of one prefix. Collects the results of the shard jobs and
+    records the keys of every finished shard in the manifest. The manifest watermark moves
+    to `last_modified` (of the listed objects) only if all shards succeed.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        shards: List[ImportShard],
+        manifest: ImportManifest,
+        last_modified: Optional[str] = None,
+    ):
+        self.prefix = prefix
+        self.last_modified = last_modified
+        self.shards = shards
+        self.manifest = manifest
+        self.items_count = 0
+        self.failed_shards: List[str] = []
+        self._shards_by_id: Dict[tuple, ImportShard] = {shard.id: shard for shard in shards}
+        self._pending = len(shards)
+        self._lock = threading.Lock()
+
+    @property
+    def is_done(self) -> bool:
+        return self._pending == 0
+
+    def skip_shard(self, shard: ImportShard) -> bool:
+        """
+        Counts the shard as failed without a job, e.g. when it is already imported by another
+        group. Its keys stay out of the manifest, so it is planned again next time.
+        Returns True when it was the last one.
+        """
+        with self._lock:
+            self.failed_shards.append(shard.path)
+            self._pending -= 1
+            return self._pending == 0
+
+    def finish_shard(
+        self, path: str, keys: Optional[List[str]], succeeded: bool, items_count: Optional[int]
+    ) -> bool:
+        """
+        Records the result of the shard job. Returns True when it was the last one.
+        """
+        shard = self._shards_by_id[(path, None if keys is None else tuple(keys))]
+        with self._lock:
+            if succeeded:
+                self.manifest.add_many(shard.new_keys)
+                self.items_count += items_count or 0
+            else:
+                self.failed_shards.append(shard.path)
+            self._pending -= 1
+            if self._pending == 0 and not self.failed_shards:
+                self.manifest.advance(self.last_modified)
+            return self._pending == 0
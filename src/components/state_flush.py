@@ -0,0 +1,122 @@
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from supervisely import logger
+from supervisely.app.content import DataJson
+
+
+class StateFlusher:
+    """
+    Coalesces DataJson updates sent to the frontend.
+
+    Once installed, every `DataJson().send_changes()` call (ours and the widgets') only marks
+    the state as changed, and a single diff is sent `delay` seconds after the first change.
+    While any thread is inside `transaction()`, nothing is sent: DataJson is one shared dict,
+    so a flush would also send the half-finished changes of that transaction. The pending
+    changes are sent when the last open transaction ends, so multi-step changes like swapping
+    badges reach the frontend as one update. Keep transactions short, they hold back the
+    updates of all threads.
+    """
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self._send: Optional[Callable[[], None]] = None
+        self._pending = False
+        self._depth = 0  # open transactions of all threads
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+
+    @property
+    def is_installed(self) -> bool:
+        return self._send is not None
+
+    def install(self) -> None:
+        """
+        Routes `DataJson().send_changes()` through the flusher.
+        """
+        data_json = DataJson()
+        with self._lock:
+            if self._send is not None:
+                return
+            self._send = data_json.send_changes
+            data_json.send_changes = self.request
+        logger.debug(f"DataJson changes are coalesced within {self.delay}s.")
+
+    def uninstall(self) -> None:
+        self.flush()
+        with self._lock:
+            if self._send is None:
+                return
+            del DataJson().send_changes  # restores the class method
+            self._send = None
+
+    def request(self, *args, **kwargs) -> None:
+        """
+        Marks the state as changed and schedules a flush if none is scheduled.
+        Calls with arguments (e.g. a target `user_id`) are sent right away.
+        """
+        if args or kwargs:
+            self._send_now(*args, **kwargs)
+            return
+        with self._lock:
+            self._pending = True
+            if self._depth > 0 or self._timer is not None:
+                return
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> None:
+        """
+        Sends the pending changes now.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending or self._depth > 0:
+                return
+            self._pending = False
+        self._send_now()
+
+    def _send_now(self, *args, **kwargs) -> None:
+        send = self._send or DataJson().send_changes
+        with self._send_lock:
+            try:
+                send(*args, **kwargs)
+            except Exception:
+                logger.error("Failed to send state changes to the frontend.", exc_info=True)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Holds back all changes until the block (and any other open transaction) ends and
+        sends them together.
+        """
+        with self._send_lock, self._lock:  # don't change the state while it is being sent
+            self._depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._depth -= 1
+                flush_now = self._depth == 0 and self._pending
+            if flush_now:
+                self.flush()
+
+
+_state_flusher: Optional[StateFlusher] = None
+_state_flusher_lock = threading.Lock()
+
+
+def get_state_flusher() -> StateFlusher:
+    """
+    Returns the flusher shared by all nodes of the app.
+    """
+    global _state_flusher
+    with _state_flusher_lock:
+        if _state_flusher is None:
+            _state_flusher = StateFlusher()
+        return _state_flusher
@@ -1,28 +1,140 @@
-from typing import Optional
+import itertools
+import threading
+from typing import Dict, List, Optional, Set
 
 import src.nodes as n
 import src.sly_globals as g
 import supervisely as sly
+from src.components.import_history import ImportHistoryIndex
+from src.components.import_jobs import ImportJob, ImportJobManager
+from src.components.sampling_stream import SampledImageStream
+from src.components.send_email.outbox import get_email_outbox
+from src.components.send_email.smtp_pool import get_smtp_pool
+from src.components.sharded_import import ImportManifest, ShardedImport, list_objects, plan_shards
+from src.components.state_flush import get_state_flusher
 
 # g.restore_data_state()
 
+MAX_CONCURRENT_IMPORTS = 4  # also the number of shards imported in parallel
+
 app = sly.Application(layout=n.layout)
 app.call_before_shutdown(g.scheduler.shutdown)  # ? does not work
+app.call_before_shutdown(n.registry.shutdown)
+
+# coalesce state updates sent to the frontend (badges, properties, history rows)
+get_state_flusher().install()
+app.call_before_shutdown(get_state_flusher().uninstall)
+app.call_before_shutdown(get_email_outbox().stop)  # unsent emails stay in the spool
+app.call_before_shutdown(get_smtp_pool().close_all)  # QUIT the pooled SMTP sessions
+
+
+def _start_import(path: Optional[str], keys: Optional[List[str]] = None) -> int:
+    """
+    Starts the import task of the path, or only of the given objects under it.
+    """
+    if keys is None:
+        return n.cloud_import.main_widget.run(path)
+    return n.cloud_import.main_widget.run(path, keys=keys)
+
+
+import_history = ImportHistoryIndex(g.api, g.project.id)
+import_jobs = ImportJobManager(
+    _start_import,
+    n.cloud_import.main_widget.wait_import_completion,
+    max_concurrent=MAX_CONCURRENT_IMPORTS,
+)
+app.call_before_shutdown(import_jobs.shutdown)
+
+
+_manifests: Dict[str, ImportManifest] = {}
+_running_prefixes: Set[str] = set()
+_running_prefixes_lock = threading.Lock()
+
+
+@import_jobs.on_complete
+def _on_import_completed(job: ImportJob):
+    items_count = None
+    if job.status == ImportJob.Status.FINISHED:
+        import_history.refresh()
+        items_count = (import_history.get(job.task_id) or {}).get("items_count")
+        if not import_jobs.active_jobs:
+            # running import tasks write the custom data that compaction rewrites
+            import_history.compact()
+
+    group = job.group
+    if group is not None:
+        succeeded = job.status == ImportJob.Status.FINISHED
+        if not group.finish_shard(job.path, job.keys, succeeded, items_count):
+            return
+        _finish_sharded_import(group)
+        items_count = group.items_count
+
+    if items_count:
+        n.input_project.update(new_items_count=items_count)
+        n.sampling.update_sampling_widgets()
 
 
-def _run_import_from_cloud(path: Optional[str] = None):
-    task_id = n.cloud_import.main_widget.run(path)
-    n.cloud_import.main_widget.wait_import_completion(task_id)
+def _finish_sharded_import(group: ShardedImport):
+    _release_prefix(group.prefix)
+    if group.failed_shards:
+        sly.logger.warning(f"Failed to import shards: {group.failed_shards}")
 
-    upd_project = g.api.project.get_info_by_id(g.project.id)
-    full_history = upd_project.custom_data.get("import_history", {}).get("tasks", [])
-    history_dict = {item["task_id"]: item for item in full_history}
 
-    last_task = history_dict.get(task_id, {})
-    last_update = last_task.get("items_count")
-    if last_update is not None:
-        n.input_project.update(new_items_count=last_update)
-        n.sampling.update_sampling_widgets()
+def _claim_prefix(path: str) -> bool:
+    with _running_prefixes_lock:
+        if path in _running_prefixes:
+            sly.logger.info(f"Import of '{path}' is still running.")
+            return False
+        _running_prefixes.add(path)
+        return True
+
+
+def _release_prefix(path: str):
+    with _running_prefixes_lock:
+        _running_prefixes.discard(path)
+
+
+def _run_import_from_cloud(path: Optional[str] = None):
+    """
+    Imports the path in the background. A cloud prefix is listed once and only the objects
+    that are new since the last import (see ImportManifest) are imported, split into shards
+    that run in parallel. If nothing is new, no import task is started, so idle automation
+    ticks cost one listing.
+    """
+    if path is None:
+        import_jobs.submit(path)
+        return
+    if _claim_prefix(path):
+        import_jobs.run_in_background(_plan_and_start_import, path)
+
+
+def _plan_and_start_import(path: str):
+    """
+    Lists the prefix, plans its shards and starts their imports. Runs in the background
+    with the prefix claimed; the prefix is released when the last shard completes.
+    """
+    try:
+        manifest = _manifests.get(path)
+        if manifest is None:
+            manifest = _manifests[path] = ImportManifest(path)
+        files = list_objects(g.api, g.team_id, path)
+        shards = plan_shards(path, files, manifest)
+    except Exception:
+        sly.logger.error(f"Failed to plan the import of '{path}'.", exc_info=True)
+        _release_prefix(path)
+        return
+    if not shards:
+        sly.logger.debug(f"No new objects in '{path}' since the last import.")
+        _release_prefix(path)
+        return
+
+    last_modified = max((f.updated_at for f in files if f.updated_at), default=None)
+    group = ShardedImport(path, shards, manifest, last_modified=last_modified)
+    for shard in shards:
+        job = import_jobs.submit(shard.path, shard.keys, group=group)
+        if job.group is not group:  # the shard is being imported as a part of another prefix
+            if group.skip_shard(shard):
+                _finish_sharded_import(group)
 
 
 @n.cloud_import.main_widget.run_btn.click
@@ -37,6 +149,7 @@ def _on_apply_automation_btn_click():
     n.cloud_import.automation_modal.hide()
     n.cloud_import.apply_automation(_run_import_from_cloud)
 
+
 def run_sampling():
     n.sampling.main_modal.hide()
     n.sampling.automation_modal.hide()
@@ -44,29 +157,52 @@ def run_sampling():
     if not sample_settinngs.get("sample_size") and not sample_settinngs.get("limit"):
         sly.logger.warning("Sampling stopped: sample size and limit are not set or both are zero.")
         return
-    res = n.sampling.main_widget.run()
-    if not res:
-        sly.logger.warning("Sampling was not finished successfully.")
-        return
-    src, dst, images_count = res
-    n.labeling_project_node.update(new_items_count=images_count)
-    n.sampling.update_sampling_widgets()
-
-    images = []
-    for imgs in dst.values():
-        images.extend(imgs)
-    g.api.entities_collection.add_items(g.labeling_collection.id, images)
+    stream = SampledImageStream(
+        g.api, g.labeling_project.id, g.labeling_collection.id, on_added=_on_sampled_images_added
+    )
+    stream.start()
+    try:
+        try:
+            res = n.sampling.main_widget.run()
+        finally:
+            stream.stop()
+        if not res:
+            sly.logger.warning("Sampling was not finished successfully.")
+            return
+        src, dst, images_count = res
+        n.labeling_project_node.update(new_items_count=images_count)
+        n.sampling.update_sampling_widgets()
+
+        result = stream.add_remaining(itertools.chain.from_iterable(dst.values()))
+    finally:
+        n.sampling.card.remove_badge_by_key(key="Adding")
+    if result.failed:
+        sly.logger.warning(f"{len(result.failed)} images were not added to the labeling queue.")
     n.queue.refresh_info()
     n.splits.set_items_count(images_count)
 
 
-n.sampling.run = run_sampling
+def _on_sampled_images_added(added: int, failed: int):
+    # the images are labelable as soon as they are in the collection
+    with get_state_flusher().transaction():
+        n.queue.refresh_info()
+        label = f"⚡ {added + failed}"
+        n.sampling.card.update_badge_by_key(key="Adding", label=label, plain=True)
 
 
+n.sampling.run = run_sampling
+
 
 n.queue.set_callback(lambda: n.splits.set_items_count(n.queue.get_labeled_images_count()))
 
 
+@n.compare_node.on_finish
+def _on_comparison_finished(result_dir: str, result_link: str):
+    n.send_email.notify_comparison(
+        result_dir, result_link, best_checkpoint=n.compare_node.result_best_checkpoint
+    )
+
+
 def _move_labeled_images():
     image_ids = n.queue.get_new_accepted_images()
     if not image_ids:
@@ -89,7 +225,6 @@ def _on_move_labeled_automation_btn_click():
     n.move_labeled.apply_automation(_move_labeled_images)
 
 
-
 # # * Restore data and state if available
 # sly.app.restore_data_state(g.task_id)
 
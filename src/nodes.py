@@ -3,22 +3,29 @@ import supervisely as sly
 from src.components import *
 from src.components.send_email.send_email import SendEmail
 
-cloud_import = sly.solution.CloudImport(
+# * Register API-backed nodes: they are built concurrently in the background pool
+registry = NodeRegistry()
+registry.register(
+    "cloud_import",
+    sly.solution.CloudImport,
     api=g.api,
     x=480,
     y=30,
     project_id=g.project.id,
     widget_id="cloud_import_widget",
 )
-auto_import = sly.solution.ManualImport(
+registry.register(
+    "auto_import",
+    sly.solution.ManualImport,
     api=g.api,
     x=820,
     y=30,
     project_id=g.project.id,
     widget_id="auto_import_widget",
 )
-
-input_project = sly.solution.ProjectNode(
+registry.register(
+    "input_project",
+    sly.solution.ProjectNode,
     api=g.api,
     x=670,
     y=150,
@@ -27,8 +34,9 @@ input_project = sly.solution.ProjectNode(
     description="Centralizes all incoming data. Data in this project will not be modified.",
     widget_id="input_project_widget",
 )
-
-sampling = sly.solution.SmartSampling(
+registry.register(
+    "sampling",
+    sly.solution.SmartSampling,
     api=g.api,
     x=635,
     y=360,
@@ -36,8 +44,9 @@ sampling = sly.solution.SmartSampling(
     dst_project=g.labeling_project.id,
     widget_id="sampling_widget",
 )
-
-labeling_project_node = sly.solution.ProjectNode(
+registry.register(
+    "labeling_project_node",
+    sly.solution.ProjectNode,
     api=g.api,
     x=670,
     y=580,
@@ -46,8 +55,9 @@ labeling_project_node = sly.solution.ProjectNode(
     description="Project specifically for labeling data. All data in this project is in the labeling process. After labeling, data will be moved to the Training Project.",
     widget_id="labeling_project_widget",
 )
-
-queue = sly.solution.LabelingQueue(
+registry.register(
+    "queue",
+    sly.solution.LabelingQueue,
     api=g.api,
     x=660,
     y=810,
@@ -55,22 +65,17 @@ queue = sly.solution.LabelingQueue(
     collection_id=g.labeling_collection.id,
     widget_id="labeling_queue_widget",
 )
-
-labeling_performance = sly.solution.LinkNode(
-    title="Labeling Performance",
-    x=1000,
-    y=804,  # -6 to align with the queue node
-    description="Explore the performance of the labeling process.",
-    tooltip_position="right",
-    link=sly.utils.abs_url("/labeling-performance"),
-)
-splits = sly.solution.TrainValSplit(
+registry.register(
+    "splits",
+    sly.solution.TrainValSplit,
     x=635,
     y=1300,
     project_id=g.project.id,
     widget_id="train_val_split_widget",
 )
-move_labeled = sly.solution.MoveLabeled(
+registry.register(
+    "move_labeled",
+    sly.solution.MoveLabeled,
     api=g.api,
     x=635,
     y=1390,
@@ -78,7 +83,9 @@ move_labeled = sly.solution.MoveLabeled(
     dst_project_id=g.labeling_project.id,
     widget_id="move_labeled_widget",
 )
-training_project = sly.solution.ProjectNode(
+registry.register(
+    "training_project",
+    sly.solution.ProjectNode,
     api=g.api,
     x=625,
     y=1490,
@@ -88,6 +95,58 @@ training_project = sly.solution.ProjectNode(
     is_training=True,
     widget_id="training_project_widget",
 )
+registry.register(
+    "evaluation_report",
+    EvaluationReportNode,
+    api=g.api,
+    project_info=g.project,
+    benchmark_dir=None,
+    title="Evaluation Report",
+    description="Quick access to the latest evaluation report of the best model from the Experiments. The report contains the model performance metrics and visualizations. Will be used as a reference for comparing with models from the next experiments.",
+    width=200,
+    x=1300,
+    y=2140,
+    tooltip_position="left",
+)
+registry.register(
+    "eval_report_after_training",
+    EvaluationReportNode,
+    g.api,
+    g.project,
+    benchmark_dir=None,
+    title="Evaluation Report",
+    description="Quick access to the evaluation report of the model after training. The report contains the model performance metrics and visualizations.",
+    width=200,
+    x=795,
+    y=2070,
+)
+compare_desc = (
+    "Compare evaluation results from the latest training session againt the best model reference report. "
+    "Helps track performance improvements over time and identify the most effective training setups. "
+    "If the new model performs better, it can be used to re-deploy the NN model for pre-labeling to speed-up the process."
+)
+registry.register(
+    "compare_node",
+    CompareNode,
+    g.api,
+    g.project,
+    "Compare Reports",
+    compare_desc,
+    250,
+    1100,
+    2300,
+    tooltip_position="left",
+)
+
+# * Nodes without API calls are built right away
+labeling_performance = sly.solution.LinkNode(
+    title="Labeling Performance",
+    x=1000,
+    y=804,  # -6 to align with the queue node
+    description="Explore the performance of the labeling process.",
+    tooltip_position="right",
+    link=sly.utils.abs_url("/labeling-performance"),
+)
 versioning = sly.solution.LinkNode(
     title="Data Versioning",
     x=635,
@@ -119,33 +178,12 @@ experiments = sly.solution.LinkNode(
     description="Track all experiments in one place. The best model for comparison will be selected from the list of experiments based on the mAP metric.",
     link=sly.utils.abs_url("/nn/experiments"),
 )
-evaluation_report = EvaluationReportNode(
-    api=g.api,
-    project_info=g.project,
-    benchmark_dir=None,
-    title="Evaluation Report",
-    description="Quick access to the latest evaluation report of the best model from the Experiments. The report contains the model performance metrics and visualizations. Will be used as a reference for comparing with models from the next experiments.",
-    width=200,
-    x=1300,
-    y=2140,
-    tooltip_position="left",
-)
 re_eval_dummy = sly.solution.LinkNode(
     "Re-evaluate Model", "Dummy Node", "", 250, 1100, 2025, dummy_icon
 )
 overview_dummy = sly.solution.LinkNode(
     "Overview + how to use model", "Dummy Node", "", 250, 795, 2000, dummy_icon
 )
-eval_report_after_training = EvaluationReportNode(
-    g.api,
-    g.project,
-    benchmark_dir=None,
-    title="Evaluation Report",
-    description="Quick access to the evaluation report of the model after training. The report contains the model performance metrics and visualizations.",
-    width=200,
-    x=795,
-    y=2070,
-)
 training_charts_dummy = sly.solution.LinkNode(
     "Training Charts", "Dummy Node", "", 250, 795, 2140, dummy_icon
 )
@@ -158,19 +196,6 @@ checkpoints_folder = sly.solution.LinkNode(
     y=2210,
     # icon=Icons(class_name="zmdi zmdi-folder"),
 )
-compare_desc = "Compare evaluation results from the latest training session againt the best model reference report. "
-"Helps track performance improvements over time and identify the most effective training setups. "
-"If the new model performs better, it can be used to re-deploy the NN model for pre-labeling to speed-up the process."
-compare_node = CompareNode(
-    g.api,
-    g.project,
-    "Compare Reports",
-    compare_desc,
-    250,
-    1100,
-    2300,
-    tooltip_position="left",
-)
 email_creds = SendEmail.EmailCredentials("user123@gmail.com", "pass123")
 send_email = SendEmailNode(
     email_creds,
@@ -196,6 +221,21 @@ comparison_report = sly.solution.LinkNode(
 )
 comparison_report.node.disable()
 
+# * Wait for the API-backed nodes
+cloud_import = registry.get("cloud_import")
+auto_import = registry.get("auto_import")
+input_project = registry.get("input_project")
+sampling = registry.get("sampling")
+labeling_project_node = registry.get("labeling_project_node")
+queue = registry.get("queue")
+splits = registry.get("splits")
+move_labeled = registry.get("move_labeled")
+training_project = registry.get("training_project")
+evaluation_report = registry.get("evaluation_report")
+eval_report_after_training = registry.get("eval_report_after_training")
+compare_node = registry.get("compare_node")
+sly.logger.debug("Solution nodes are built.", extra={"timings": registry.timings})
+
 # * Create a SolutionGraphBuilder instance
 graph_builder = sly.solution.SolutionGraphBuilder(height="2800px")
 
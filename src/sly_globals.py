@@ -1,4 +1,7 @@
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from dotenv import load_dotenv
 
@@ -7,6 +10,7 @@ from supervisely.solution.scheduler import TasksScheduler
 
 LOCAL_DATA = "data.json"
 LOCAL_STATE = "state.json"
+BOOTSTRAP_WORKERS = 5
 
 
 if sly.is_development():
@@ -18,61 +22,128 @@ team_id = sly.env.team_id()
 workspace_id = sly.env.workspace_id()
 scheduler = TasksScheduler()
 PROJECT_NAME = "Solution_005"
-project = api.project.get_or_create(workspace_id, PROJECT_NAME)
-update_project = False
-custom_data = project.custom_data
-if "labeling_project" not in custom_data:
-    labeling_project = api.project.create(
-        workspace_id,
-        f"{PROJECT_NAME} (labeling)",
-        change_name_if_conflict=True,
-        description="labeling project",
-    )
-    custom_data["labeling_project"] = labeling_project.id
-    update_project = True
-else:
-    labeling_project = api.project.get_info_by_id(custom_data["labeling_project"])
-
-if "training_project" not in custom_data:
-    training_project = api.project.create(
-        workspace_id,
-        f"{PROJECT_NAME} (training)",
-        change_name_if_conflict=True,
-        description="training project",
-    )
-    custom_data["training_project"] = training_project.id
-    update_project = True
-else:
-    training_project = api.project.get_info_by_id(custom_data["training_project"])
-
-
-if "labeling_collection" not in custom_data:
-    labeling_collection = api.entities_collection.create(labeling_project.id, "Labeling Collection")
-    custom_data["labeling_collection"] = labeling_collection.id
-    update_project = True
-else:
-    labeling_collection = api.entities_collection.get_info_by_id(custom_data["labeling_collection"])
-
-if "labeling_queue" not in custom_data:
-    user_ids = [api.user.get_my_info().id]
-    labeling_queue = api.labeling_queue.create(
-        name="Labeling Queue for Solutions",
-        user_ids=user_ids,
-        reviewer_ids=user_ids,
-        collection_id=labeling_collection.id,
-        dynamic_classes=True,
-        dynamic_tags=True,
-        allow_review_own_annotations=True,
-        skip_complete_job_on_empty=True,
+
+
+def _bootstrap_resources(api: sly.Api, workspace_id: int, project_name: str) -> dict:
+    """
+    Resolves the solution resources (projects, labeling collection and queue).
+
+    Independent resources are fetched concurrently, dependent ones are created as soon as
+    their parent is available, so the total time follows the slowest dependency chain.
+    Newly created resource IDs are written to the project custom data in a single update.
+    """
+    timings = {}
+    timings_lock = threading.Lock()
+    created = {}
+
+    def timed(name: str, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with timings_lock:
+                timings[name] = timings.get(name, 0) + time.perf_counter() - start
+
+    bootstrap_start = time.perf_counter()
+    project = timed("project", api.project.get_or_create, workspace_id, project_name)
+    custom_data = project.custom_data
+
+    def get_or_create_project(key: str, suffix: str, description: str) -> sly.ProjectInfo:
+        if key in custom_data:
+            return timed(key, api.project.get_info_by_id, custom_data[key])
+        info = timed(
+            key,
+            api.project.create,
+            workspace_id,
+            f"{project_name} ({suffix})",
+            change_name_if_conflict=True,
+            description=description,
+        )
+        created[key] = info.id
+        return info
+
+    def get_or_create_collection(labeling_project_future):
+        if "labeling_collection" in custom_data:
+            return timed(
+                "labeling_collection",
+                api.entities_collection.get_info_by_id,
+                custom_data["labeling_collection"],
+            )
+        labeling_project = labeling_project_future.result()
+        info = timed(
+            "labeling_collection",
+            api.entities_collection.create,
+            labeling_project.id,
+            "Labeling Collection",
+        )
+        created["labeling_collection"] = info.id
+        return info
+
+    def get_or_create_queue(collection_future, user_future):
+        if "labeling_queue" in custom_data:
+            return timed(
+                "labeling_queue", api.labeling_queue.get_info_by_id, custom_data["labeling_queue"]
+            )
+        labeling_collection = collection_future.result()
+        user_ids = [user_future.result().id]
+        queue_id = timed(
+            "labeling_queue",
+            api.labeling_queue.create,
+            name="Labeling Queue for Solutions",
+            user_ids=user_ids,
+            reviewer_ids=user_ids,
+            collection_id=labeling_collection.id,
+            dynamic_classes=True,
+            dynamic_tags=True,
+            allow_review_own_annotations=True,
+            skip_complete_job_on_empty=True,
+        )
+        info = timed("labeling_queue", api.labeling_queue.get_info_by_id, queue_id)
+        created["labeling_queue"] = info.id
+        return info
+
+    with ThreadPoolExecutor(BOOTSTRAP_WORKERS, thread_name_prefix="bootstrap") as executor:
+        user_future = None
+        if "labeling_queue" not in custom_data:
+            user_future = executor.submit(timed, "user", api.user.get_my_info)
+        labeling_project_future = executor.submit(
+            get_or_create_project, "labeling_project", "labeling", "labeling project"
+        )
+        training_project_future = executor.submit(
+            get_or_create_project, "training_project", "training", "training project"
+        )
+        collection_future = executor.submit(get_or_create_collection, labeling_project_future)
+        queue_future = executor.submit(get_or_create_queue, collection_future, user_future)
+
+        resources = {
+            "project": project,
+            "labeling_project": labeling_project_future.result(),
+            "training_project": training_project_future.result(),
+            "labeling_collection": collection_future.result(),
+            "labeling_queue": queue_future.result(),
+        }
+
+    if created:
+        custom_data.update(created)
+        timed("custom_data", api.project.update_custom_data, project.id, custom_data)
+    resources["custom_data"] = custom_data
+
+    total = time.perf_counter() - bootstrap_start
+    report = ", ".join(f"{name}: {sec:.2f}s" for name, sec in timings.items())
+    sly.logger.info(
+        f"Solution resources are ready in {total:.2f}s ({report}).",
+        extra={"timings": timings, "created": list(created)},
     )
-    labeling_queue = api.labeling_queue.get_info_by_id(labeling_queue)
-    custom_data["labeling_queue"] = labeling_queue.id
-    update_project = True
-else:
-    labeling_queue = api.labeling_queue.get_info_by_id(custom_data["labeling_queue"])
-
-if update_project:
-    api.project.update_custom_data(project.id, custom_data)
+    return resources
+
+
+_resources = _bootstrap_resources(api, workspace_id, PROJECT_NAME)
+project = _resources["project"]
+custom_data = _resources["custom_data"]
+labeling_project = _resources["labeling_project"]
+training_project = _resources["training_project"]
+labeling_collection = _resources["labeling_collection"]
+labeling_queue = _resources["labeling_queue"]
 
 if sly.is_development():
     sly.logger.setLevel(10)